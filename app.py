@@ -0,0 +1,28 @@
+"""ASGI entry point serving the dashboard and its JSON API from one process.
+
+    uvicorn app:app --host 0.0.0.0 --port 8501
+
+The Streamlit UI is served as usual and the routes of `scenario_api` are
+mounted under /api, reading the same loaded catalogs as the UI sessions.
+Sign-in goes through the /auth routes of `dashboard_auth`, which keep the
+session token in an HttpOnly cookie.
+
+Needs Streamlit 1.57.0 or later, the first release that ships `st.App` (the
+Starlette-based server), plus starlette, uvicorn and python-multipart (for
+the login form), all listed in requirements.txt. `streamlit run
+fraud_dashboard.py` keeps working without the API, signing in through the
+dashboard's own form instead.
+"""
+import os
+
+import streamlit as st
+from starlette.middleware import Middleware
+
+import dashboard_auth
+import scenario_api
+
+app = st.App(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fraud_dashboard.py'),
+    routes=dashboard_auth.routes() + scenario_api.routes(),
+    middleware=[Middleware(dashboard_auth.LoginRedirectMiddleware)]
+)
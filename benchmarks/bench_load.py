@@ -0,0 +1,352 @@
+"""Load-test the dashboard with many concurrent analyst sessions.
+
+Usage:
+    python benchmarks/bench_load.py                            # 1, 10, 50, 100, 250, 500 sessions
+    python benchmarks/bench_load.py --sessions 1 100 --clicks 5 --think 0
+    python benchmarks/bench_load.py --rows 100000              # against a synthetic catalog
+    python benchmarks/bench_load.py --url http://host:8501 --server-pid 1234
+
+Starts `streamlit run fraud_dashboard.py` on a free local port with a
+throwaway user (unless --url is given; then pass --password or set
+FRAUD_DASHBOARD_BENCH_PASSWORD for --user on that server) and drives every
+session over Streamlit's websocket protocol with the same messages a browser
+sends: sign in through the dashboard's form, then `--clicks` times open a
+quadrant and press "Back to Matrix Overview", which brings the heatmap back. Each rerun is timed from the widget message to the server's
+`script_finished`. Per concurrency level the script reports p50/p95/p99
+latency per action, reruns per second and the server's resident memory growth
+per session (Linux only, read from /proc).
+
+Needs `websockets` on top of the dashboard's own requirements:
+
+    pip install -r benchmarks/requirements.txt
+
+Results are written to benchmarks/results/load-<git commit>.json. The exit
+status is 1 if any session failed or any rerun raised an exception in the
+dashboard ("script errors"); only a run that exits 0 counts as passing.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import platform
+import random
+import secrets
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+from bench_pipeline import RESULTS_DIR, git_commit  # noqa: E402
+
+DEFAULT_SESSIONS = [1, 10, 50, 100, 250, 500]
+DEFAULT_USER = 'analyst'
+
+# Widget keys of the nine matrix buttons
+QUADRANT_KEYS = [f"{bv}-{feas}" for bv in ('high', 'medium', 'low') for feas in ('high', 'medium', 'low')]
+BACK_LABEL = 'Back to Matrix Overview'
+
+# Seconds a single rerun may take before the session is counted as failed
+DEFAULT_TIMEOUT = 120
+
+
+class Session:
+    """One simulated browser tab: a websocket plus the widgets it has been sent"""
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.widgets = {}
+        self.latencies = {}
+        self.errors = 0
+        self.heatmaps = 0
+
+    async def connect(self):
+        # Browsers do not ping; a busy server would otherwise drop the connection
+        self.ws = await websockets.connect(self.url, max_size=None, open_timeout=self.timeout, ping_interval=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def find(self, key=None, label=None):
+        """(widget id, fragment id) of the widget with this key or label text"""
+        for widget_id, (widget_label, fragment_id) in self.widgets.items():
+            if (key is not None and widget_id.endswith(f"-{key}")) or (label is not None and label in widget_label):
+                return widget_id, fragment_id
+        raise LookupError(f"widget {key or label!r} is not on the page")
+
+    async def rerun(self, action, widget_states=(), fragment_id=''):
+        """Send one rerun request and time it until the script (or fragment) finishes"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta':
+                self._track(forward.delta)
+            elif kind == 'script_finished' and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                # A run cut short by st.rerun() is followed by the run that replaces it
+                break
+        self.latencies.setdefault(action, []).append(time.perf_counter() - start)
+
+    def _track(self, delta):
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            self.errors += 1
+        elif kind == 'plotly_chart':
+            self.heatmaps += 1
+        widget = getattr(element, kind)
+        widget_id = getattr(widget, 'id', '')
+        if widget_id.startswith('$$ID-'):
+            self.widgets[widget_id] = (getattr(widget, 'label', ''), delta.fragment_id)
+
+    async def click(self, action, key=None, label=None):
+        widget_id, fragment_id = self.find(key=key, label=label)
+        state = BackMsg().rerun_script.widget_states.widgets.add()
+        state.id = widget_id
+        state.trigger_value = True
+        await self.rerun(action, [state], fragment_id)
+
+    async def login(self, user, password):
+        await self.rerun('login page')
+        msg = BackMsg()
+        for key, value in (('username', user), ('password', password)):
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = self.find(key=key)[0]
+            state.string_value = value
+        await self.rerun('password', msg.rerun_script.widget_states.widgets)
+        self.find(key=QUADRANT_KEYS[0])  # the matrix is only shown after a successful login
+
+
+async def analyst(session, user, password, clicks, think, rng):
+    """The scripted flow of one analyst; returns why it failed, or None"""
+    try:
+        await session.connect()
+        await session.login(user, password)
+        for _ in range(clicks):
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+            await session.click('quadrant', key=rng.choice(QUADRANT_KEYS))
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+            await session.click('back', label=BACK_LABEL)
+        return None
+    except (OSError, LookupError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+        return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+
+def rss_bytes(pid):
+    """Resident memory of a process, or None where /proc is unavailable"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run_level(url, count, args, server_pid):
+    """Run `count` concurrent analysts and summarise their reruns"""
+    rng = random.Random(count)
+    sessions = [Session(url, args.timeout) for _ in range(count)]
+    rss_before = rss_bytes(server_pid)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*[
+        analyst(session, args.user, args.password, args.clicks, args.think, random.Random(rng.random()))
+        for session in sessions
+    ])
+    elapsed = time.perf_counter() - start
+    # Sampled while every session is still connected
+    rss_after = rss_bytes(server_pid)
+    await asyncio.gather(*[session.close() for session in sessions])
+
+    latencies = {}
+    for session in sessions:
+        for action, values in session.latencies.items():
+            latencies.setdefault(action, []).extend(values)
+    reruns = sum(len(values) for values in latencies.values())
+    result = {
+        'sessions': count,
+        'failed_sessions': sum(outcome is not None for outcome in outcomes),
+        'failures': dict(collections.Counter(outcome for outcome in outcomes if outcome is not None)),
+        'script_errors': sum(session.errors for session in sessions),
+        'heatmaps': sum(session.heatmaps for session in sessions),
+        'seconds': round(elapsed, 3),
+        'reruns': reruns,
+        'reruns_per_second': round(reruns / elapsed, 2),
+        'latency_ms': {
+            action: {
+                'p50': round(percentile(values, 50) * 1000, 1),
+                'p95': round(percentile(values, 95) * 1000, 1),
+                'p99': round(percentile(values, 99) * 1000, 1),
+                'mean': round(statistics.fmean(values) * 1000, 1),
+                'count': len(values),
+            }
+            for action, values in latencies.items()
+        },
+    }
+    if rss_before is not None and rss_after is not None:
+        result['server_rss_mb'] = round(rss_after / 2**20, 1)
+        result['rss_per_session_kb'] = round(max(rss_after - rss_before, 0) / count / 1024, 1)
+    return result
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def write_users_file(path, user, password):
+    """Throwaway user store holding only the benchmark's own user"""
+    import dashboard_auth
+
+    with open(path, 'w') as handle:
+        json.dump({user: {'hash': dashboard_auth.hash_password(password), 'generation': 0}}, handle)
+    return path
+
+
+def start_server(port, catalog_dir, users_file):
+    """Start the dashboard headless on `port` and wait until it answers its health check"""
+    env = {**os.environ, 'FRAUD_DASHBOARD_RELOAD_INTERVAL': '0', 'FRAUD_DASHBOARD_USERS_FILE': users_file}
+    if catalog_dir is not None:
+        env['FRAUD_DASHBOARD_CATALOG_DIR'] = catalog_dir
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', os.path.join(ROOT, 'fraud_dashboard.py'),
+         '--server.headless', 'true', '--server.port', str(port),
+         '--browser.gatherUsageStats', 'false', '--server.fileWatcherType', 'none'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit exited with status {server.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("Streamlit did not become healthy within 60s")
+
+
+def print_level(result):
+    memory = ''
+    if 'rss_per_session_kb' in result:
+        memory = f", server RSS {result['server_rss_mb']:.0f} MB (+{result['rss_per_session_kb']:.0f} KB/session)"
+    print(f"{result['sessions']:>4} sessions: {result['reruns']} reruns in {result['seconds']:.1f}s, "
+          f"{result['reruns_per_second']:.1f} reruns/s, {result['failed_sessions']} failed, "
+          f"{result['script_errors']} script errors{memory}")
+    for reason, count in result['failures'].items():
+        print(f"       {count} x {reason}")
+    for action, stats in result['latency_ms'].items():
+        print(f"       {action:<12} p50 {stats['p50']:8.1f} ms  p95 {stats['p95']:8.1f} ms  p99 {stats['p99']:8.1f} ms")
+
+
+async def run(url, args, server_pid):
+    # One warm-up session so imports and caches are not charged to the first level
+    await run_level(url, 1, args, server_pid)
+    results = []
+    for count in args.sessions:
+        result = await run_level(url, count, args, server_pid)
+        print_level(result)
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSIONS, help='concurrency levels')
+    parser.add_argument('--clicks', type=int, default=3, help='quadrant/back round trips per session')
+    parser.add_argument('--think', type=float, default=0.5, help='mean seconds between an analyst\'s actions')
+    parser.add_argument('--user', default=DEFAULT_USER)
+    parser.add_argument('--password', default=os.environ.get('FRAUD_DASHBOARD_BENCH_PASSWORD'),
+                        help='password of --user on the --url server (default: $FRAUD_DASHBOARD_BENCH_PASSWORD)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds before a rerun counts as failed')
+    parser.add_argument('--rows', type=int, help='serve a synthetic catalog of this many rows')
+    parser.add_argument('--url', help='base URL of an already running dashboard')
+    parser.add_argument('--server-pid', type=int, help='pid of the --url server, for memory figures')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/load-<commit>.json)')
+    args = parser.parse_args()
+    if args.url and not args.password:
+        parser.error('--url needs the password of --user (--password or $FRAUD_DASHBOARD_BENCH_PASSWORD)')
+
+    workdir = tempfile.mkdtemp(prefix='fraud-load-')
+    server = None
+    try:
+        catalog_dir = None
+        if args.rows:
+            import synthetic
+            synthetic.write_catalog(os.path.join(workdir, 'fraud_framework.csv'), args.rows)
+            catalog_dir = workdir
+
+        if args.url:
+            base_url, server_pid = args.url.rstrip('/'), args.server_pid
+        else:
+            # A server started here gets its own user with a one-off password
+            args.password = secrets.token_urlsafe(16)
+            users_file = write_users_file(os.path.join(workdir, 'users.json'), args.user, args.password)
+            port = free_port()
+            server = start_server(port, catalog_dir, users_file)
+            base_url, server_pid = f"http://127.0.0.1:{port}", server.pid
+        ws_url = base_url.replace('http', 'ws', 1) + '/_stcore/stream'
+        results = asyncio.run(run(ws_url, args, server_pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'clicks': args.clicks,
+        'think_seconds': args.think,
+        'rows': args.rows,
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nWrote {output}")
+
+    if any(result['failed_sessions'] or result['script_errors'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""Benchmark the dashboard's data pipeline on synthetic catalogs.
+
+Usage:
+    python benchmarks/bench_pipeline.py                      # 1k, 10k, 100k rows
+    python benchmarks/bench_pipeline.py --sizes 1000 1000000
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<old>.json
+
+Results are written to benchmarks/results/<git commit>.json so runs on
+different commits can be compared with --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+# No background watcher threads while benchmarking
+os.environ['FRAUD_DASHBOARD_RELOAD_INTERVAL'] = '0'
+
+import synthetic  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Number of scenario cards rendered through AppTest per catalog size
+RENDER_CARDS = 100
+
+# Slowdowns smaller than this are timer noise, not regressions
+MIN_REGRESSION_SECONDS = 0.002
+
+RENDER_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import streamlit as st
+import scenario_data
+import scenario_store
+from dashboard_views import display_scenario_details
+
+df = scenario_store.open_store({csv!r})
+data = scenario_data.build_dataset(df, 'bench')
+start = time.perf_counter()
+for position in range(min({cards}, len(df))):
+    display_scenario_details(data, position)
+st.session_state['render_seconds'] = time.perf_counter() - start
+"""
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def timed(func, repeat):
+    """Median wall time of `repeat` calls and the last return value"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def bench_render(csv_path, cards):
+    """Seconds spent rendering `cards` scenario cards inside a real script run"""
+    from streamlit.testing.v1 import AppTest
+
+    script = RENDER_SCRIPT.format(root=ROOT, csv=csv_path, cards=cards)
+    app = AppTest.from_string(script, default_timeout=600)
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return app.session_state['render_seconds']
+
+
+def bench_size(rows, repeat, workdir):
+    import dashboard_views
+    import scenario_data
+    import scenario_reload
+    import scenario_similarity
+
+    results = {}
+    csv_dir = os.path.join(workdir, str(rows))
+    os.makedirs(csv_dir, exist_ok=True)
+    csv_path = synthetic.write_catalog(os.path.join(csv_dir, 'fraud_framework.csv'), rows)
+    results['csv_bytes'] = os.path.getsize(csv_path)
+
+    # The catalog registry scans the working directory when it is created
+    cwd = os.getcwd()
+    os.chdir(csv_dir)
+    try:
+        scenario_reload.reset_shared_registries()
+        results['load_data_cold'], _ = timed(dashboard_views.load_data, 1)
+
+        def load_warm():
+            scenario_reload.reset_shared_registries()
+            return dashboard_views.load_data()
+        results['load_data_warm'], data = timed(load_warm, repeat)
+        results['load_data_rerun'], _ = timed(dashboard_views.load_data, repeat)
+    finally:
+        os.chdir(cwd)
+
+    df = data['df']
+    results['create_matrix_data'], _ = timed(
+        lambda: dashboard_views.create_matrix_data(df, data['quadrant_index']), repeat)
+    results['create_matrix_data_unindexed'], _ = timed(
+        lambda: dashboard_views.create_matrix_data(df), repeat)
+    results['create_category_heatmap'], (_, category_matrix) = timed(
+        lambda: dashboard_views.create_category_heatmap(df, data['category_counts']), repeat)
+    results['category_counts'], _ = timed(lambda: scenario_data.category_counts(df), repeat)
+    results['category_insights'], _ = timed(lambda: scenario_data.category_insights(category_matrix), repeat)
+    results['search'], _ = timed(lambda: data['search_index'].search('refund claim'), repeat)
+    results['build_similarity_index'], similarity_index = timed(
+        lambda: scenario_similarity.build_similarity_index(df), repeat)
+    results['similar_scenarios'], _ = timed(lambda: similarity_index.similar(0), repeat)
+    # A fresh index per run so the cached band keys are rebuilt every time
+    results['near_duplicates'], _ = timed(
+        lambda: scenario_similarity.SimilarityIndex(similarity_index.signatures).near_duplicates(), repeat)
+
+    cards = min(rows, RENDER_CARDS)
+    results['render_cards'] = cards
+    results['display_scenario_details'] = bench_render(csv_path, cards)
+    return results
+
+
+def compare(current, baseline_path, threshold):
+    """Print per-stage ratios against a previous run; return True if anything regressed"""
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+
+    regressed = False
+    print(f"\nComparison with {baseline.get('commit')} ({baseline_path}):")
+    for size, stages in current['results'].items():
+        old_stages = baseline['results'].get(size, {})
+        for stage, seconds in stages.items():
+            old = old_stages.get(stage)
+            if not isinstance(old, float) or not isinstance(seconds, float) or old == 0:
+                continue
+            ratio = seconds / old
+            flag = ''
+            if ratio > 1 + threshold and seconds - old > MIN_REGRESSION_SECONDS:
+                flag = '  <-- regression'
+                regressed = True
+            print(f"  {size:>9} {stage:<30} {old:10.4f}s -> {seconds:10.4f}s  x{ratio:5.2f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage (median is reported)')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='previous result file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {},
+    }
+
+    workdir = tempfile.mkdtemp(prefix='fraud-bench-')
+    try:
+        for rows in args.sizes:
+            print(f"Benchmarking {rows:,} rows...", flush=True)
+            report['results'][str(rows)] = bench_size(rows, args.repeat, workdir)
+            for stage, value in report['results'][str(rows)].items():
+                print(f"  {stage:<30} {value:.4f}" if isinstance(value, float) else f"  {stage:<30} {value}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Measure cold-start import time of the dashboard against a budget.
+
+Usage:
+    python benchmarks/bench_startup.py                  # median of 5 fresh interpreters
+    python benchmarks/bench_startup.py --budget-ms 700 --top 15
+
+Every run starts a new interpreter under `python -X importtime` and times:
+  * login page: what `streamlit run fraud_dashboard.py` imports before the
+    login form can be shown (Streamlit and the entry script's modules);
+  * dashboard: what is imported after login (`dashboard_views`: pandas,
+    Arrow, the indexes);
+  * heatmap: Plotly's graph objects and the first figure built with them.
+The heaviest top-level imports are listed from the importtime report, and the
+script exits with status 1 when the login page exceeds its budget.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+# Import-time budget (milliseconds) of everything needed to render the login page
+LOGIN_PAGE_BUDGET_MS = float(os.environ.get('FRAUD_DASHBOARD_STARTUP_BUDGET_MS', 800))
+
+# Code run per stage, in order, in one fresh interpreter. The entry script itself
+# is not imported because it calls Streamlit at module level.
+STAGES = {
+    'login page': 'import streamlit, dashboard_auth, dashboard_style, rerun_profiler',
+    'dashboard': 'import dashboard_views',
+    # Plotly loads its figure classes lazily, so building one is part of the cost
+    'heatmap': 'import plotly.graph_objects as go, plotly.io; go.Figure(go.Heatmap(z=[[0]])).to_json()',
+}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def cold_start():
+    """Wall milliseconds per stage and {top-level import: ms} from one fresh interpreter"""
+    code = ['import json, time', 'timings = {}']
+    for stage, statement in STAGES.items():
+        code += ['start = time.perf_counter()', statement,
+                 f'timings[{stage!r}] = (time.perf_counter() - start) * 1000']
+    code.append('print(json.dumps(timings))')
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '\n'.join(code)],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': ROOT}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Top-level entries only; nested imports are already in their parent's cumulative time
+        if match and not match.group(3):
+            imports[match.group(4)] = imports.get(match.group(4), 0) + int(match.group(2)) / 1000
+    return json.loads(result.stdout.strip().splitlines()[-1]), imports
+
+
+def measure(repeat):
+    """Median milliseconds per stage, plus the heaviest top-level imports of the last run"""
+    samples = {stage: [] for stage in STAGES}
+    imports = {}
+    for _ in range(repeat):
+        timings, imports = cold_start()
+        for stage, ms in timings.items():
+            samples[stage].append(ms)
+    return {stage: statistics.median(values) for stage, values in samples.items()}, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per stage (median is reported)')
+    parser.add_argument('--budget-ms', type=float, default=LOGIN_PAGE_BUDGET_MS, help='login page import budget')
+    parser.add_argument('--top', type=int, default=10, help='number of heaviest imports to list')
+    args = parser.parse_args()
+
+    stages, heaviest = measure(args.repeat)
+    for stage, ms in stages.items():
+        print(f"  {stage:<12} {ms:8.1f} ms")
+    print(f"  {'total':<12} {sum(stages.values()):8.1f} ms")
+
+    print("\nHeaviest top-level imports:")
+    for name, ms in sorted(heaviest.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<30} {ms:8.1f} ms")
+
+    login_ms = stages['login page']
+    if login_ms > args.budget_ms:
+        print(f"\nLogin page imports take {login_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"\nLogin page imports within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == '__main__':
+    main()
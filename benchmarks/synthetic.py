@@ -0,0 +1,74 @@
+"""Synthetic fraud framework catalogs shaped like fraud_framework.csv.
+
+Text columns reuse the lengths and vocabulary of the real catalog, so
+tokenizing, rendering and parsing costs scale realistically with row count.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_CSV = os.path.join(ROOT, 'fraud_framework.csv')
+
+RATING_COLUMNS = ['Effort', 'Complexity', 'Feasibility', 'Business Value']
+RATINGS = np.array(['Low', 'Medium', 'High'], dtype=object)
+
+
+def _template():
+    df = pd.read_csv(TEMPLATE_CSV, dtype=object)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def _random_text(rng, vocabulary, lengths, size):
+    """`size` strings of random vocabulary words, word counts drawn from `lengths`"""
+    word_counts = rng.choice(lengths, size=size)
+    words = rng.choice(vocabulary, size=int(word_counts.sum()))
+    return [' '.join(chunk) for chunk in np.split(words, np.cumsum(word_counts)[:-1])]
+
+
+def make_catalog(rows, seed=0):
+    """Build a synthetic catalog DataFrame with `rows` scenarios"""
+    rng = np.random.default_rng(seed)
+    template = _template()
+    data = {}
+
+    # Roughly sqrt(n) categories, like a catalog that grows by adding areas
+    n_categories = max(len(template['Category'].unique()), int(np.sqrt(rows)))
+    categories = np.array([f"Category {i:04d}" for i in range(n_categories)], dtype=object)
+
+    fields = sorted({
+        field.strip()
+        for value in template['Data Fields'].dropna()
+        for field in value.split(',')
+    })
+    # Widen the field pool so coverage queries see a realistic spread
+    fields = np.array(fields + [f"{field}_{i}" for field in fields for i in range(3)], dtype=object)
+
+    for column in template.columns:
+        values = template[column].dropna()
+        if column == 'Category':
+            data[column] = rng.choice(categories, size=rows)
+        elif column == 'Scenario':
+            data[column] = [f"Scenario {i:07d}" for i in range(rows)]
+        elif column in RATING_COLUMNS:
+            data[column] = rng.choice(RATINGS, size=rows, p=[0.2, 0.5, 0.3])
+        elif column == 'Data Fields':
+            counts = rng.integers(4, 12, size=rows)
+            picks = rng.choice(fields, size=int(counts.sum()))
+            data[column] = [', '.join(chunk) for chunk in np.split(picks, np.cumsum(counts)[:-1])]
+        elif len(values) == 0:
+            data[column] = np.full(rows, np.nan)
+        else:
+            vocabulary = np.array(' '.join(values).split(), dtype=object)
+            lengths = values.str.split().str.len().to_numpy()
+            data[column] = _random_text(rng, vocabulary, lengths, rows)
+
+    return pd.DataFrame(data, columns=template.columns)
+
+
+def write_catalog(path, rows, seed=0):
+    """Write a synthetic catalog CSV and return its path"""
+    make_catalog(rows, seed).to_csv(path, index=False)
+    return path
@@ -0,0 +1,97 @@
+"""Category x quadrant counts summed across many catalogs with a process-pool map-reduce.
+
+Each worker brings one catalog's Arrow store up to date, maps only the three
+columns the crosstab needs and returns its partial count matrix. The parent
+adds partials up as they arrive, so its memory holds a handful of small
+matrices regardless of how many catalogs there are, and each worker holds at
+most one catalog at a time.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import scenario_data
+import scenario_store
+
+logger = logging.getLogger(__name__)
+
+# The only columns a partial crosstab needs
+COUNT_COLUMNS = ['Category', 'Business Value', 'Feasibility']
+
+
+def catalog_fingerprint(csv_paths):
+    """Cheap stat-based key for a set of catalogs; changes whenever any file does"""
+    fingerprint = []
+    for path in sorted(csv_paths):
+        try:
+            stat = os.stat(path)
+            fingerprint.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            fingerprint.append((os.path.basename(path), None, None))
+    return tuple(fingerprint)
+
+
+def partial_category_counts(csv_path):
+    """Map step: (version, scenario count, category x quadrant counts) of one catalog"""
+    version = scenario_store.ensure_store(csv_path)
+    df = scenario_store.open_store(csv_path, columns=COUNT_COLUMNS)
+    return version, len(df), scenario_data.category_counts(df)
+
+
+def _add_counts(total, partial):
+    """Reduce step: sum two count matrices, aligning categories"""
+    if total is None:
+        return partial
+    return total.add(partial, fill_value=0).astype(int)
+
+
+def combined_category_counts(csv_paths, max_workers=None):
+    """Sum the category counts of every catalog in `csv_paths`.
+
+    Returns `(counts, totals, errors)`: the summed count matrix (None if no
+    catalog could be read), the number of scenarios per catalog and the
+    error message of every catalog that failed to load.
+    """
+    csv_paths = list(csv_paths)
+    counts, totals, errors = None, {}, {}
+    if not csv_paths:
+        return counts, totals, errors
+
+    workers = min(len(csv_paths), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        # Not worth a process pool for a single catalog (or a single core)
+        for path in csv_paths:
+            name = os.path.basename(path)
+            try:
+                _, totals[name], partial = partial_category_counts(path)
+            except Exception as e:
+                # One broken catalog must not take the combined view down with it
+                errors[name] = str(e) or type(e).__name__
+                logger.warning("Skipping catalog %s in combined counts: %s", name, e)
+                continue
+            counts = _add_counts(counts, partial)
+    else:
+        counts = _map_reduce(csv_paths, workers, totals, errors)
+
+    return counts.sort_index() if counts is not None else None, totals, errors
+
+
+def _map_reduce(csv_paths, workers, totals, errors):
+    """Run the map step in worker processes and reduce partials as they complete"""
+    counts = None
+    # Spawned workers do not inherit the app's threads or its loaded catalogs
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(partial_category_counts, path): os.path.basename(path) for path in csv_paths}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                _, totals[name], partial = future.result()
+            except Exception as e:
+                # Includes BrokenProcessPool when a worker dies mid-catalog
+                errors[name] = str(e) or type(e).__name__
+                logger.warning("Skipping catalog %s in combined counts: %s", name, e)
+                continue
+            counts = _add_counts(counts, partial)
+    return counts
@@ -0,0 +1,381 @@
+"""Login for the dashboard: a hashed user store and signed, revocable session tokens.
+
+Credentials live in a local JSON file (FRAUD_DASHBOARD_USERS_FILE, default
+dashboard_users.json) mapping user names to a PBKDF2-SHA256 hash and a token
+generation; it stands in for an identity provider and is re-read whenever it
+changes. No user exists until one is added:
+
+    python dashboard_auth.py add-user alice
+    python dashboard_auth.py remove-user alice
+    python dashboard_auth.py revoke alice         # end every session of alice
+    python dashboard_auth.py issue-token alice    # bearer token for the JSON API
+
+A session token is HMAC-signed and holds the user name, an expiry and the
+user's token generation. Logging out bumps the generation, so every token
+issued before stops verifying at its next check, on every replica. Replicas
+that share FRAUD_DASHBOARD_AUTH_SECRET (or the secret file
+FRAUD_DASHBOARD_SECRET_FILE, created on first use) accept the same tokens.
+Checking a token is one HMAC; signatures and password hashes are compared
+in constant time.
+
+Served through `app.py`, the login form is a plain HTML page posted to
+/auth/login, which sets the token as an HttpOnly, Secure, SameSite=Strict
+cookie, so page scripts never see it; browsers accept Secure cookies over
+plain HTTP only from localhost. Under `streamlit run` there is no HTTP route
+to set cookies from, so the dashboard falls back to its own login form and a
+login lasts for the browser session only.
+"""
+import argparse
+import base64
+import contextlib
+import getpass
+import hashlib
+import hmac
+import html
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent revocations are not serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+USERS_FILE = os.environ.get('FRAUD_DASHBOARD_USERS_FILE', 'dashboard_users.json')
+SECRET_FILE = os.environ.get('FRAUD_DASHBOARD_SECRET_FILE', '.dashboard_secret')
+
+# Lifetime of a session token (and its cookie)
+SESSION_HOURS = float(os.environ.get('FRAUD_DASHBOARD_SESSION_HOURS', 12))
+COOKIE_NAME = 'fraud_dashboard_session'
+
+HASH_ALGORITHM = 'pbkdf2_sha256'
+HASH_ITERATIONS = 200_000
+
+LOGIN_PATH = '/auth/login'
+LOGOUT_PATH = '/auth/logout'
+
+_store = None
+_store_lock = threading.Lock()
+_secret = None
+# Set once the login routes are mounted; sessions are then trusted only through the cookie
+_server_login = False
+
+
+def hash_password(password, iterations=HASH_ITERATIONS):
+    """Salted PBKDF2-SHA256 hash in the `algorithm$iterations$salt$digest` format"""
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return '$'.join([HASH_ALGORITHM, str(iterations), _b64encode(salt), _b64encode(digest)])
+
+
+def check_hash(password, stored):
+    """True if `password` matches a hash made by hash_password"""
+    try:
+        algorithm, iterations, salt, digest = stored.split('$')
+        iterations = int(iterations)
+    except (AttributeError, ValueError):
+        return False
+    if algorithm != HASH_ALGORITHM:
+        return False
+    candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), _b64decode(salt), iterations)
+    return hmac.compare_digest(candidate, _b64decode(digest))
+
+
+# Checked when the user name is unknown, so a miss takes as long as a hit
+_DUMMY_HASH = '$'.join([HASH_ALGORITHM, str(HASH_ITERATIONS), 'A' * 22, 'A' * 43])
+
+
+class UserStore:
+    """User name -> {'hash': password hash, 'generation': token generation}, loaded from a JSON file"""
+
+    def __init__(self, path=USERS_FILE):
+        self.path = path
+        self.users = {}
+        self._fingerprint = None
+
+    def reload(self, strict=False):
+        """Re-read the file if it changed since the last load; a missing file means no users.
+
+        An unreadable or corrupt file also means no users, so every login fails
+        until it is fixed; with `strict` the error is raised instead.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.users, self._fingerprint = {}, None
+            return self
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        if fingerprint != self._fingerprint:
+            try:
+                with open(self.path) as handle:
+                    users = json.load(handle)
+                if not isinstance(users, dict):
+                    raise ValueError("expected a JSON object of users")
+            except (OSError, ValueError) as e:
+                if strict:
+                    raise
+                logger.error("Cannot read the user store %s (%s); rejecting every login until it is fixed", self.path, e)
+                users = {}
+            # Entries written before revocation existed are a bare hash
+            self.users = {
+                name: entry if isinstance(entry, dict) else {'hash': entry, 'generation': 0}
+                for name, entry in users.items()
+            }
+            self._fingerprint = fingerprint
+        return self
+
+    def verify(self, username, password):
+        """True if the user exists and the password matches its hash"""
+        entry = self.users.get(username)
+        matched = check_hash(password, entry['hash'] if entry is not None else _DUMMY_HASH)
+        return matched and entry is not None
+
+    def generation(self, username):
+        """Token generation of a user, or None if the user does not exist"""
+        entry = self.users.get(username)
+        return entry.get('generation', 0) if entry is not None else None
+
+    @contextlib.contextmanager
+    def editing(self):
+        """Reload, let the caller change `users` and save, holding a lock against other processes"""
+        with open(f"{self.path}.lock", 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._fingerprint = None
+            # Never save over a file that could not be read
+            self.reload(strict=True)
+            yield self.users
+            self.save()
+
+    def save(self):
+        """Write the users to a temporary file and rename it over the store, so readers never see half a file"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as handle:
+                json.dump(self.users, handle, indent=2, sort_keys=True)
+                handle.write('\n')
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def get_user_store():
+    """The process-wide UserStore, refreshed from disk if the file changed"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UserStore()
+        return _store.reload()
+
+
+def revoke_sessions(username):
+    """Invalidate every token issued to `username` so far"""
+    store = get_user_store()
+    with _store_lock, store.editing() as users:
+        if username in users:
+            users[username]['generation'] = users[username].get('generation', 0) + 1
+
+
+def _signing_key():
+    """Secret shared by every replica: the environment, or a file created on first use"""
+    global _secret
+    if _secret is not None:
+        return _secret
+    secret = os.environ.get('FRAUD_DASHBOARD_AUTH_SECRET')
+    if not secret:
+        try:
+            # O_EXCL: when several replicas start at once, exactly one writes the secret
+            fd = os.open(SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w') as handle:
+                handle.write(secrets.token_hex(32))
+        except FileExistsError:
+            pass
+        with open(SECRET_FILE) as handle:
+            secret = handle.read().strip()
+    _secret = secret.encode()
+    return _secret
+
+
+def _sign(payload):
+    return _b64encode(hmac.new(_signing_key(), payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(username, hours=SESSION_HOURS):
+    """Signed session token for `username`, valid for `hours` or until the user's sessions are revoked"""
+    generation = get_user_store().generation(username)
+    payload = _b64encode(json.dumps([username, int(time.time() + hours * 3600), generation]).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_token(token):
+    """User name of a valid, unexpired, unrevoked token for a user that still exists, else None"""
+    if not token or token.count('.') != 1:
+        return None
+    payload, signature = token.split('.')
+    if not hmac.compare_digest(signature.encode(), _sign(payload).encode()):
+        return None
+    try:
+        username, expires, generation = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if expires < time.time() or generation is None or get_user_store().generation(username) != generation:
+        return None
+    return username
+
+
+def server_login_enabled():
+    """True when the login routes are mounted, so the session cookie can be set over HTTP"""
+    return _server_login
+
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Fraud Framework Access</title>
+<style>
+body {{ font-family: sans-serif; display: flex; justify-content: center; align-items: center; height: 90vh; margin: 0; }}
+form {{ padding: 2rem; border-radius: 10px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); max-width: 400px; text-align: center; }}
+h2 {{ color: #1f77b4; }}
+input {{ display: block; width: 100%; box-sizing: border-box; margin: 0.5rem 0; padding: 0.5rem; }}
+.error {{ color: #c62828; }}
+</style></head>
+<body><form method="post" action="{action}">
+<h2>🔒 Fraud Framework Access</h2>
+<p>Please sign in to access the dashboard</p>
+{message}
+<input name="username" placeholder="User name" autocomplete="username" required autofocus>
+<input name="password" type="password" placeholder="Password" autocomplete="current-password" required>
+<input type="submit" value="Sign in">
+</form></body></html>
+"""
+
+
+def _login_page(message='', status_code=200):
+    from starlette.responses import HTMLResponse
+
+    body = LOGIN_PAGE.format(action=LOGIN_PATH, message=f'<p class="error">{html.escape(message)}</p>' if message else '')
+    return HTMLResponse(body, status_code=status_code, headers={'Cache-Control': 'no-store'})
+
+
+def _session_redirect(location, token, hours=SESSION_HOURS):
+    """Redirect that stores `token` in the session cookie (an empty token clears it)"""
+    from starlette.responses import RedirectResponse
+
+    response = RedirectResponse(location, status_code=303)
+    response.set_cookie(
+        COOKIE_NAME, token, max_age=int(hours * 3600) if token else 0,
+        path='/', secure=True, httponly=True, samesite='strict'
+    )
+    return response
+
+
+async def login(request):
+    """GET shows the login form; POST checks it and sets the session cookie"""
+    from starlette.concurrency import run_in_threadpool
+
+    if request.method == 'GET':
+        return _login_page()
+    form = await request.form()
+    username = str(form.get('username', '')).strip()
+    password = str(form.get('password', ''))
+    # PBKDF2 takes ~100 ms; keep it off the event loop
+    if not password or not await run_in_threadpool(get_user_store().verify, username, password):
+        return _login_page("User name or password incorrect. Please try again.", status_code=401)
+    return _session_redirect('/', issue_token(username))
+
+
+async def logout(request):
+    """Revoke the user's sessions and clear the cookie"""
+    username = verify_token(request.cookies.get(COOKIE_NAME))
+    if username is not None:
+        revoke_sessions(username)
+    return _session_redirect(LOGIN_PATH, '')
+
+
+class LoginRedirectMiddleware:
+    """Send page loads without a valid session cookie straight to the login form"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] == '/':
+            from starlette.requests import Request
+
+            if verify_token(Request(scope).cookies.get(COOKIE_NAME)) is None:
+                await _session_redirect(LOGIN_PATH, '')(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def routes():
+    """Login and logout routes to mount alongside the Streamlit app"""
+    from starlette.routing import Route
+
+    global _server_login
+    _server_login = True
+    return [
+        Route(LOGIN_PATH, login, methods=['GET', 'POST']),
+        Route(LOGOUT_PATH, logout, methods=['GET', 'POST']),
+    ]
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add-user', help='add a user or change their password')
+    add.add_argument('username')
+    remove = commands.add_parser('remove-user', help='remove a user; their sessions end at the next check')
+    remove.add_argument('username')
+    revoke = commands.add_parser('revoke', help='end every session of a user')
+    revoke.add_argument('username')
+    issue = commands.add_parser('issue-token', help='print a session token for scripts calling the JSON API')
+    issue.add_argument('username')
+    issue.add_argument('--hours', type=float, default=SESSION_HOURS, help='lifetime of the token')
+    args = parser.parse_args()
+
+    try:
+        store = UserStore().reload(strict=True)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Cannot read {USERS_FILE}: {e}")
+    if args.command != 'add-user' and args.username not in store.users:
+        sys.exit(f"No user '{args.username}' in {store.path}")
+    if args.command == 'issue-token':
+        print(issue_token(args.username, args.hours))
+        return
+
+    password = None
+    if args.command == 'add-user':
+        password = getpass.getpass(f"Password for {args.username}: ")
+        if not password or password != getpass.getpass("Repeat password: "):
+            sys.exit("Passwords are empty or do not match")
+    with store.editing() as users:
+        if args.command == 'add-user':
+            # A new password also ends the sessions opened with the old one
+            generation = users[args.username]['generation'] + 1 if args.username in users else 0
+            users[args.username] = {'hash': hash_password(password), 'generation': generation}
+        elif args.command == 'revoke':
+            users[args.username]['generation'] += 1
+        else:
+            users.pop(args.username, None)
+    print(f"Updated {store.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Styles shared by the dashboard and the static snapshot pages."""
+
+DASHBOARD_CSS = """
+<style>
+.main-header {
+    font-size: 2.5rem;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+.matrix-button {
+    border: 2px solid #ddd;
+    border-radius: 15px;
+    padding: 20px;
+    margin: 5px;
+    text-align: center;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    min-height: 140px;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+    font-size: 14px;
+    line-height: 1.4;
+}
+.matrix-button:hover {
+    border-color: #1f77b4;
+    box-shadow: 0 6px 12px rgba(31, 119, 180, 0.2);
+    transform: translateY(-2px);
+}
+.high-high {
+    background: linear-gradient(135deg, #e8f5e8, #c8e6c9);
+    border-color: #4caf50;
+}
+.high-medium {
+    background: linear-gradient(135deg, #fff3e0, #ffcc80);
+    border-color: #ff9800;
+}
+.high-low {
+    background: linear-gradient(135deg, #ffebee, #ffcdd2);
+    border-color: #f44336;
+}
+.medium-high {
+    background: linear-gradient(135deg, #e3f2fd, #90caf9);
+    border-color: #2196f3;
+}
+.medium-medium {
+    background: linear-gradient(135deg, #f5f5f5, #e0e0e0);
+    border-color: #9e9e9e;
+}
+.medium-low {
+    background: linear-gradient(135deg, #fce4ec, #f8bbd9);
+    border-color: #e91e63;
+}
+.low-high {
+    background: linear-gradient(135deg, #f3e5f5, #ce93d8);
+    border-color: #9c27b0;
+}
+.low-medium {
+    background: linear-gradient(135deg, #fff8e1, #ffecb3);
+    border-color: #ffc107;
+}
+.low-low {
+    background: linear-gradient(135deg, #efebe9, #d7ccc8);
+    border-color: #795548;
+}
+.scenario-card {
+    background: white;
+    border-radius: 10px;
+    padding: 20px;
+    margin: 10px 0;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    border-left: 5px solid #1f77b4;
+}
+.scenario-columns {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 1rem;
+}
+.field-label {
+    font-weight: bold;
+    color: #1f77b4;
+    margin-top: 15px;
+    margin-bottom: 5px;
+}
+.field-value {
+    background-color: #f8f9fa;
+    padding: 10px;
+    border-radius: 5px;
+    border-left: 3px solid #dee2e6;
+}
+.metric-big {
+    font-size: 2rem;
+    font-weight: bold;
+    color: #1f77b4;
+}
+.quadrant-title {
+    font-size: 1.2rem;
+    font-weight: bold;
+    margin-bottom: 10px;
+}
+.axis-label {
+    font-weight: bold;
+    color: #1f77b4;
+    font-size: 16px;
+}
+.count-highlight {
+    font-size: 24px;
+    font-weight: bold;
+    color: #1f77b4;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
+}
+div[data-testid="stButton"] > button {
+    height: 140px;
+    white-space: pre-line;
+    font-size: 13px;
+    line-height: 1.3;
+}
+</style>
+"""
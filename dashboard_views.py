@@ -0,0 +1,1023 @@
+"""Data-backed views of the dashboard: loading catalogs, the matrix, heatmap and drill-downs.
+
+Imported by `fraud_dashboard` only once the user has logged in, so the login
+page of a fresh process renders without pandas, Arrow or the indexes loaded.
+Plotly figures are built only when the heatmap is first needed.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import functools
+import html
+import math
+import os
+import time
+
+import catalog_aggregate
+import dashboard_auth
+import scenario_data
+import scenario_export
+import scenario_fields
+import scenario_reload
+import scenario_scoring
+import view_cache
+
+# Drill-down pagination
+PAGE_SIZE_OPTIONS = [5, 10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = int(os.environ.get('FRAUD_DASHBOARD_PAGE_SIZE', 10))
+
+# Maximum number of ranked hits returned by the search box
+SEARCH_RESULT_LIMIT = 200
+
+# Default number of scenarios in the "build next" ranking
+DEFAULT_TOP_K = 10
+
+# Maximum number of rows listed in the data field coverage table
+COVERAGE_RESULT_LIMIT = 500
+
+# Similar scenarios listed under a card, and the lowest estimated similarity shown
+SIMILAR_SCENARIO_LIMIT = 5
+MIN_SIMILARITY = 0.1
+
+# Maximum number of pairs listed in the near-duplicate table
+DUPLICATE_RESULT_LIMIT = 500
+
+# Bounds of the process-wide view cache
+VIEW_CACHE_ENTRIES = int(os.environ.get('FRAUD_DASHBOARD_VIEW_CACHE_ENTRIES', 10_000))
+VIEW_CACHE_MB = int(os.environ.get('FRAUD_DASHBOARD_VIEW_CACHE_MB', 256))
+
+# Where finished exports are kept (reused until the catalog version changes)
+EXPORT_DIR = os.environ.get('FRAUD_DASHBOARD_EXPORT_DIR', scenario_export.EXPORT_DIR)
+
+# Worker processes used to combine all catalogs (0 = one per CPU)
+AGGREGATE_WORKERS = int(os.environ.get('FRAUD_DASHBOARD_AGGREGATE_WORKERS', 0))
+
+def get_catalog_registry():
+    """Process-wide registry of catalog watchers shared by every session and the JSON API"""
+    return scenario_reload.shared_registry()
+
+@st.cache_data(ttl=30)
+def list_catalogs():
+    """Catalog CSVs available in the catalog directory (re-scanned every 30 seconds)"""
+    return get_catalog_registry().catalogs()
+
+def select_catalog():
+    """Let the user pick a catalog when more than one is available"""
+    catalogs = list_catalogs()
+    if len(catalogs) <= 1:
+        return catalogs[0] if catalogs else scenario_reload.DEFAULT_CATALOG
+    
+    default = catalogs.index(scenario_reload.DEFAULT_CATALOG) if scenario_reload.DEFAULT_CATALOG in catalogs else 0
+    with st.sidebar:
+        return st.selectbox("📚 Catalog", catalogs, index=default, key="catalog")
+
+def load_data(catalog_name=scenario_reload.DEFAULT_CATALOG, warn_stale=True):
+    """Load a fraud framework catalog together with its version and derived indexes.
+
+    Fragments load the catalog again on every run, so a rerun after a background
+    reload never keeps the dataset of an earlier run; they pass `warn_stale=False`
+    to leave the stale-version warning to the full page run.
+    """
+    try:
+        catalog = get_catalog_registry().get(catalog_name)
+        data = catalog.get()
+    except FileNotFoundError:
+        st.error(f"Please ensure '{catalog_name}' is in the catalog directory of this app.")
+        return None
+    except ValueError as e:
+        st.error(f"'{catalog_name}' failed schema validation: {e}")
+        return None
+    
+    if warn_stale and catalog.error is not None:
+        st.warning(f"The latest edit of '{catalog_name}' could not be loaded ({catalog.error}). Showing the previous version.")
+    return data
+
+def create_matrix_data(df, quadrant_index=None):
+    """Create matrix data grouped by Business Value and Feasibility"""
+    if quadrant_index is None:
+        quadrant_index = scenario_data.build_quadrant_index(scenario_data.quadrant_codes(df))
+    
+    return {
+        key: df.iloc[rows]
+        for key, rows in quadrant_index.items()
+        if len(rows) > 0
+    }
+
+def create_category_heatmap(df, category_counts=None):
+    """Create a heatmap showing category distribution across matrix quadrants"""
+    if category_counts is None:
+        category_counts = scenario_data.category_counts(df)
+    category_matrix = scenario_data.trim_category_matrix(category_counts)
+    
+    # Create heatmap using Plotly (imported here so only the heatmap pays for it)
+    import plotly.graph_objects as go
+    fig = go.Figure(data=go.Heatmap(
+        z=category_matrix.values,
+        x=category_matrix.columns,
+        y=category_matrix.index,
+        colorscale='Blues',
+        text=category_matrix.values,
+        texttemplate="%{text}",
+        textfont={"size": 12, "color": "white"},
+        hoverongaps=False,
+        hovertemplate='<b>%{y}</b><br>Priority Level: %{x}<br>Count: %{z}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title={
+            'text': '🗺️ Category Distribution Across Priority Levels',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20, 'color': '#1f77b4'}
+        },
+        xaxis_title='Priority Level',
+        yaxis_title='Fraud Category',
+        width=1200,
+        height=600,
+        font=dict(size=12),
+        xaxis=dict(tickangle=45),
+        plot_bgcolor='white'
+    )
+    
+    return fig, category_matrix
+
+@st.cache_resource
+def get_view_cache():
+    """Process-wide cache of derived views, shared by every session"""
+    return view_cache.ViewCache(max_entries=VIEW_CACHE_ENTRIES, max_bytes=VIEW_CACHE_MB * 1024 * 1024)
+
+def cached_view(data, name, *filters, compute):
+    """Look up a derived view by data version, view name and filter state"""
+    return get_view_cache().get_or_compute((data['version'], name) + filters, compute)
+
+def show_figure(fig_json):
+    """Display a figure cached as JSON"""
+    import plotly.io as pio
+    st.plotly_chart(pio.from_json(fig_json, skip_invalid=True), use_container_width=True)
+
+def load_category_heatmap(data):
+    """Heatmap figure (as JSON) and crosstab for one data version, reused across reruns"""
+    def compute():
+        fig, category_matrix = create_category_heatmap(data['df'], data['category_counts'])
+        return fig.to_json(), category_matrix
+    return cached_view(data, 'heatmap', compute=compute)
+
+def load_category_insights(data, category_matrix):
+    """Key Insights for one data version, reused across reruns"""
+    return cached_view(data, 'insights', compute=lambda: scenario_data.category_insights(category_matrix))
+
+def load_combined_heatmap(catalogs):
+    """Heatmap figure (as JSON), crosstab, per-catalog totals and errors summed over all catalogs"""
+    directory = get_catalog_registry().directory
+    paths = [os.path.join(directory, name) for name in catalogs]
+
+    def compute():
+        counts, totals, errors = catalog_aggregate.combined_category_counts(paths, AGGREGATE_WORKERS or None)
+        if counts is None:
+            return None, None, totals, errors
+        fig, category_matrix = create_category_heatmap(None, counts)
+        fig.update_layout(title={'text': f'🌍 Category Distribution Across {len(totals)} Catalogs'})
+        return fig.to_json(), category_matrix, totals, errors
+
+    # Keyed by file stats, so any edit to any catalog recomputes the aggregate
+    key = ('combined-heatmap', catalog_aggregate.catalog_fingerprint(paths))
+    return get_view_cache().get_or_compute(key, compute)
+
+def get_quadrant_info(bv, feas):
+    """Get quadrant information and styling"""
+    quadrant_info = {
+        'High-High': {
+            'title': 'Quick Wins',
+            'description': 'High Business Value & High Feasibility',
+            'class': 'high-high',
+            'icon': '🎯'
+        },
+        'High-Medium': {
+            'title': 'Major Projects',
+            'description': 'High Business Value & Medium Feasibility',
+            'class': 'high-medium',
+            'icon': '🚀'
+        },
+        'High-Low': {
+            'title': 'Challenging',
+            'description': 'High Business Value & Low Feasibility',
+            'class': 'medium-low',
+            'icon': '⛰️'
+        },
+        'Medium-High': {
+            'title': 'Fill-ins',
+            'description': 'Medium Business Value & High Feasibility',
+            'class': 'medium-high',
+            'icon': '🔧'
+        },
+        'Medium-Medium': {
+            'title': 'Consider Carefully',
+            'description': 'Medium Business Value & Medium Feasibility',
+            'class': 'medium-medium',
+            'icon': '🤔'
+        },
+        'Medium-Low': {
+            'title': 'Questionable',
+            'description': 'Medium Business Value & Low Feasibility',
+            'class': 'medium-low',
+            'icon': '⚠️'
+        },
+        'Low-High': {
+            'title': 'Easy Wins',
+            'description': 'Low Business Value & High Feasibility',
+            'class': 'medium-high',
+            'icon': '🎈'
+        },
+        'Low-Medium': {
+            'title': 'Reconsider',
+            'description': 'Low Business Value & Medium Feasibility',
+            'class': 'medium-medium',
+            'icon': '🔍'
+        },
+        'Low-Low': {
+            'title': 'Avoid',
+            'description': 'Low Business Value & Low Feasibility',
+            'class': 'medium-low',
+            'icon': '❌'
+        }
+    }
+    
+    key = f"{bv}-{feas}"
+    return quadrant_info.get(key, {
+        'title': 'Other',
+        'description': f'{bv} Business Value & {feas} Feasibility',
+        'class': 'medium-medium',
+        'icon': '📋'
+    })
+
+# Narrative fields shown in the left column of a scenario card: (label, column, default)
+CARD_TEXT_FIELDS = [
+    ('🎯 Objective', 'Objective', None),
+    ('⚙️ Mechanic', 'Mechanic', None),
+    ('🔍 Important Aspects/Loopholes', 'Important aspects/ loopholes', None),
+    ('🚨 Detection Rule & Signal', 'Detection Rule & Signal', None),
+    ('📊 Must Have Data', 'Must Have Data', None),
+    ('🗃️ Data Fields', 'Data Fields', None),
+    ('💰 Benefit to Costco', 'Benefit to Costco (severity, frequency & Value)', 'Not specified'),
+    ('💼 Business Input on Practicality', 'Input on praticality from Business', 'Not specified'),
+]
+
+# Colours for "less is better" (Effort, Complexity) and "more is better" ratings
+COST_COLORS = {'Low': '#4caf50', 'Medium': '#ff9800', 'High': '#f44336'}
+GAIN_COLORS = {'Low': '#f44336', 'Medium': '#ff9800', 'High': '#4caf50'}
+
+# Assessment fields shown in the right column: (label, rating column, reason column, colours)
+CARD_RATING_FIELDS = [
+    ('💪 Effort Assessment', 'Effort', 'Effort Reason', COST_COLORS),
+    ('🧩 Complexity Assessment', 'Complexity', 'Complexity Reason', COST_COLORS),
+    ('✅ Feasibility Assessment', 'Feasibility', 'Feasibility Reason', GAIN_COLORS),
+    ('💎 Business Value Assessment', 'Business Value', 'Business Value Reason', GAIN_COLORS),
+]
+
+def _card_text(scenario_data, column, default=None):
+    """Escaped cell text on a single line, falling back to `default` for missing values"""
+    value = scenario_data.get(column)
+    if value is None or pd.isna(value):
+        return html.escape(default) if default is not None else ''
+    # A blank line inside a cell would end the HTML block and spill the card into markdown
+    return html.escape(str(value)).replace('\r\n', '\n').replace('\n', '<br>')
+
+def render_scenario_card(scenario_data):
+    """Build the complete, escaped HTML for one scenario card"""
+    parts = [
+        '<div class="scenario-card">',
+        f'<h3 style="color: #1f77b4; margin-top: 0;">{_card_text(scenario_data, "Scenario")}</h3>',
+        f'<h4 style="color: #666; margin-top: 5px;">Category: {_card_text(scenario_data, "Category")}</h4>',
+        '</div>',
+        '<div class="scenario-columns"><div>',
+    ]
+    
+    for label, column, default in CARD_TEXT_FIELDS:
+        parts.append(f'<div class="field-label">{label}</div>')
+        parts.append(f'<div class="field-value">{_card_text(scenario_data, column, default)}</div>')
+    
+    parts.append('</div><div>')
+    
+    for label, column, reason_column, colors in CARD_RATING_FIELDS:
+        rating = scenario_data.get(column)
+        color = colors.get(rating, '#666')
+        parts.append(f'<div class="field-label">{label}</div>')
+        parts.append(
+            f'<div class="field-value"><span style="color: {color}; font-weight: bold;">'
+            f'{_card_text(scenario_data, column)}</span><br>'
+            f'<small>{_card_text(scenario_data, reason_column)}</small></div>'
+        )
+    
+    parts.append('</div></div>')
+    # No newlines or indentation, so markdown never treats part of the card as a code block
+    return ''.join(parts)
+
+def scenario_card_html(data, position):
+    """Card HTML for one row of one data version, reused across reruns and sessions"""
+    return cached_view(data, 'card', position, compute=lambda: render_scenario_card(data['df'].iloc[position]))
+
+# Card content written to exports: (label, column, reason column or None); the first is the title
+EXPORT_SECTIONS = [
+    ('Scenario', 'Scenario', None),
+    ('Category', 'Category', None),
+    ('Priority Level', 'Quadrant', None),
+] + [(label, column, None) for label, column, _ in CARD_TEXT_FIELDS] + [
+    (label, column, reason_column) for label, column, reason_column, _ in CARD_RATING_FIELDS
+]
+
+def similar_scenarios_markdown(data, position):
+    """(count, markdown list) of the scenarios most similar to one row"""
+    rows, scores = data['similarity_index'].similar(position, SIMILAR_SCENARIO_LIMIT, MIN_SIMILARITY)
+    similar = data['df'].iloc[rows]
+    lines = [
+        f"- **{html.escape(str(name))}** · {html.escape(str(category))} · {quadrant} · {score:.0%} similar"
+        for name, category, quadrant, score in zip(similar['Scenario'], similar['Category'], similar['Quadrant'], scores)
+    ]
+    return len(rows), '\n'.join(lines)
+
+def display_scenario_details(data, position, heading=''):
+    """Display detailed information for a scenario, followed by the scenarios most similar to it"""
+    st.markdown(f'{heading}{scenario_card_html(data, position)}', unsafe_allow_html=True)
+    
+    count, similar = cached_view(data, 'similar', position, compute=lambda: similar_scenarios_markdown(data, position))
+    if count:
+        with st.expander(f"🔁 {count} similar scenario{'s' if count != 1 else ''}"):
+            st.markdown(similar)
+
+def page_bounds(total, page_size, page):
+    """Return (start, stop) row offsets for a 1-based page, clamped to the data"""
+    page_count = max(1, math.ceil(total / page_size))
+    page = min(max(page, 1), page_count)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+def display_scenario_page(data, rows, scope, page_of):
+    """Display one page of scenarios (a quadrant or search results) instead of every card at once.
+
+    `scope` ("search" or "quadrant") fixes the widget keys, so both lists can
+    be on screen together; the page goes back to 1 whenever `page_of` (the
+    query or quadrant shown) or the data version changes.
+    """
+    total = len(rows)
+    page_key = f"page-{scope}"
+    # Set before the number input is created, so Streamlit accepts the reset.
+    # Streamlit drops the page widget's state on runs that do not draw it (going
+    # back to the matrix, clearing the search), so a missing page resets as well.
+    shown = (page_of, data['version'])
+    if st.session_state.get(f"{page_key}-of") != shown or page_key not in st.session_state:
+        st.session_state[f"{page_key}-of"] = shown
+        st.session_state[page_key] = 1
+    
+    nav_col1, nav_col2, nav_col3 = st.columns([1, 1, 2])
+    with nav_col1:
+        page_size = st.selectbox(
+            "Scenarios per page",
+            PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE) if DEFAULT_PAGE_SIZE in PAGE_SIZE_OPTIONS else 1,
+            key=f"page-size-{scope}"
+        )
+    page_count = max(1, math.ceil(total / page_size))
+    # A larger page size can leave the stored page past the end
+    st.session_state[page_key] = min(st.session_state[page_key], page_count)
+    with nav_col2:
+        page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key=page_key)
+    start, stop = page_bounds(total, page_size, page)
+    with nav_col3:
+        st.markdown(f"Showing scenarios **{start + 1}-{stop}** of **{total}** (page {page} of {page_count})")
+    
+    # Only the visible slice is rendered, one markdown element per card
+    render_start = time.perf_counter()
+    for idx, position in enumerate(rows[start:stop], start=start):
+        display_scenario_details(data, int(position), f'<h3>Scenario {idx + 1}</h3>')
+        st.markdown('<hr>', unsafe_allow_html=True)
+    render_ms = (time.perf_counter() - render_start) * 1000
+    
+    st.caption(f"Rendered {stop - start} scenario cards in {render_ms:.1f} ms")
+
+@st.cache_resource
+def get_export_manager():
+    """Process-wide background exporter shared by every session"""
+    return scenario_export.ExportManager(EXPORT_DIR)
+
+def read_export(path):
+    with open(path, 'rb') as handle:
+        return handle.read()
+
+def quadrant_rows_of(data, quadrant):
+    return data['quadrant_index'].get(quadrant, [])
+
+def matrix_order(data):
+    """Every row ordered by quadrant (matrix order), unrated scenarios last"""
+    def compute():
+        codes = data['quadrant_codes']
+        return np.argsort(np.where(codes < 0, len(scenario_data.QUADRANT_NAMES), codes), kind='stable')
+    return cached_view(data, 'matrix-order', compute=compute)
+
+@st.fragment(run_every=0.5)
+def display_export_progress(job, fmt):
+    """Poll a running export; once it finishes, rerun the page to show the download button"""
+    if job.finished.is_set():
+        st.rerun()
+    if job.saving:
+        st.progress(job.progress, text=f"Writing the {fmt} file ({job.total} scenarios)...")
+    else:
+        st.progress(job.progress, text=f"Preparing {fmt} export: {job.done} of {job.total} scenarios")
+
+@st.fragment
+def display_export(catalog_name, rows_of, scope, title):
+    """Build an export of `rows_of(data)` in the background, showing progress and then a download button"""
+    data = load_data(catalog_name, warn_stale=False)
+    if data is None:
+        return
+    rows = rows_of(data)
+    manager = get_export_manager()
+    format_col, action_col = st.columns([1, 3])
+    with format_col:
+        fmt = st.selectbox("Export format", scenario_export.available_formats(), key=f"export-format-{scope}")
+    job = manager.job(catalog_name, data['version'], scope, fmt)
+    
+    with action_col:
+        if job is not None and job.error is not None:
+            st.warning(f"The last {fmt} export failed: {job.error}")
+        if job is None or job.error is not None:
+            if st.button(f"📤 Export {len(rows)} scenarios as {fmt}", key=f"export-{scope}-{fmt}"):
+                job = manager.submit(catalog_name, data, rows, scope, fmt, EXPORT_SECTIONS)
+        
+        if job is None or job.error is not None:
+            return
+        if not job.finished.is_set():
+            display_export_progress(job, fmt)
+            return
+        
+        extension, mime, _ = scenario_export.FORMATS[fmt]
+        # Read only when the button is clicked, not on every rerun
+        st.download_button(
+            f"⬇️ Download {fmt}",
+            data=functools.partial(read_export, job.path),
+            file_name=f"{title}.{extension}",
+            mime=mime,
+            key=f"download-{scope}-{fmt}"
+        )
+
+def priority_table(data, top_k, weights):
+    """Table of the top-K scenarios for a set of scoring weights"""
+    rows, scores = data['priority_index'].top_k(top_k, weights)
+    ranked = data['df'].iloc[rows]
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(rows) + 1),
+        'Scenario': ranked['Scenario'].to_numpy(),
+        'Category': ranked['Category'].astype(str).to_numpy(),
+        'Priority Level': ranked['Quadrant'].astype(str).to_numpy(),
+        'Score': np.round(scores, 1),
+        **{criterion: ranked[criterion].astype(str).to_numpy() for criterion in scenario_scoring.CRITERIA}
+    })
+
+@st.fragment
+def display_priority_ranking(catalog_name):
+    """Show the top-K scenarios by weighted priority score"""
+    data = load_data(catalog_name, warn_stale=False)
+    if data is None:
+        return
+    st.markdown("### 🏆 Top Scenarios to Build Next")
+    
+    with st.expander("⚖️ Scoring weights"):
+        weight_cols = st.columns(len(scenario_scoring.CRITERIA))
+        weights = {}
+        for col, criterion in zip(weight_cols, scenario_scoring.CRITERIA):
+            with col:
+                direction = "higher is better" if criterion in scenario_scoring.GAIN_CRITERIA else "lower is better"
+                weights[criterion] = st.slider(
+                    criterion,
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=scenario_scoring.DEFAULT_WEIGHTS[criterion],
+                    step=0.05,
+                    key=f"weight-{criterion}",
+                    help=f"Weight of {criterion} in the score ({direction})"
+                )
+    
+    top_k = st.number_input("Number of scenarios", min_value=1, max_value=500, value=DEFAULT_TOP_K, step=5, key="top_k")
+    
+    rank_start = time.perf_counter()
+    weight_key = tuple(weights[criterion] for criterion in scenario_scoring.CRITERIA)
+    table = cached_view(data, 'top_k', int(top_k), weight_key, compute=lambda: priority_table(data, int(top_k), weights))
+    rank_ms = (time.perf_counter() - rank_start) * 1000
+    
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.caption(f"Ranked {len(data['df'])} scenarios in {rank_ms:.2f} ms")
+
+@st.fragment
+def display_field_coverage(catalog_name):
+    """Show which scenarios can run with the data fields available in the warehouse"""
+    data = load_data(catalog_name, warn_stale=False)
+    if data is None:
+        return
+    field_index = data['field_index']
+    df = data['df']
+    
+    st.markdown("### 🗃️ Data Field Coverage")
+    available = st.multiselect(
+        "Data fields available in your warehouse",
+        field_index.fields,
+        key="available_fields",
+        placeholder="Select the fields you already have..."
+    )
+    if not available:
+        st.caption(f"{len(field_index.fields)} distinct data fields are referenced across {len(df)} scenarios.")
+        return
+    
+    fully_covered_only = st.checkbox("Only scenarios that are fully covered", key="fully_covered_only")
+    fully_covered, total, table = cached_view(
+        data, 'coverage', tuple(sorted(available)), fully_covered_only,
+        compute=lambda: coverage_table(data, available, fully_covered_only)
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Fully Covered Scenarios", fully_covered)
+    with col2:
+        st.metric("Partially Covered Scenarios", total - fully_covered)
+    
+    if total == 0:
+        st.info("No scenarios are covered by the selected fields.")
+        return
+    
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    if total > len(table):
+        st.caption(f"Showing the {len(table)} best covered of {total} scenarios.")
+
+def coverage_table(data, available, fully_covered_only):
+    """Coverage counts and the listed rows for a set of available fields"""
+    coverage = data['field_index'].coverage(available, include_partial=not fully_covered_only)
+    fully_covered = int((coverage['coverage'] >= 1).sum())
+    
+    # Missing fields are only worked out for the rows that are listed
+    shown = coverage.head(COVERAGE_RESULT_LIMIT)
+    rows = data['df'].iloc[shown.index]
+    available_set = {field.lower() for field in available}
+    table = pd.DataFrame({
+        'Scenario': rows['Scenario'].to_numpy(),
+        'Category': rows['Category'].astype(str).to_numpy(),
+        'Priority Level': rows['Quadrant'].astype(str).to_numpy(),
+        'Coverage': (shown['coverage'] * 100).round().astype(int).astype(str).to_numpy() + '%',
+        'Fields': (shown['covered'].astype(str) + ' / ' + shown['required'].astype(str)).to_numpy(),
+        'Missing Fields': [
+            ', '.join(f for f in dict.fromkeys(scenario_fields.parse_fields(value)) if f not in available_set)
+            for value in rows[scenario_fields.FIELDS_COLUMN]
+        ],
+    })
+    return fully_covered, len(coverage), table
+
+def duplicate_table(data, threshold):
+    """Table of every scenario pair estimated at least `threshold` similar, most similar first"""
+    pairs, scores = data['similarity_index'].near_duplicates(threshold)
+    total = len(pairs)
+    pairs, scores = pairs[:DUPLICATE_RESULT_LIMIT], scores[:DUPLICATE_RESULT_LIMIT]
+    df = data['df']
+    first, second = df.iloc[pairs[:, 0]], df.iloc[pairs[:, 1]]
+    table = pd.DataFrame({
+        'Scenario': first['Scenario'].to_numpy(),
+        'Category': first['Category'].astype(str).to_numpy(),
+        'Similar Scenario': second['Scenario'].to_numpy(),
+        'Similar Category': second['Category'].astype(str).to_numpy(),
+        'Similarity': pd.Series((scores * 100).round().astype(int)).astype(str).to_numpy() + '%',
+    })
+    return total, table
+
+@st.fragment
+def display_near_duplicates(catalog_name):
+    """List scenario pairs that look like duplicates of each other"""
+    data = load_data(catalog_name, warn_stale=False)
+    if data is None:
+        return
+    st.markdown("### 🔁 Possible Duplicate Scenarios")
+    threshold = st.slider(
+        "Minimum similarity",
+        min_value=0.5,
+        max_value=1.0,
+        value=0.6,
+        step=0.05,
+        key="duplicate_threshold",
+        help="Estimated overlap of the Mechanic, Detection Rule & Signal and Data Fields of two scenarios. "
+             "Pairs are found through locality-sensitive hashing, so some pairs close to the minimum may be missed."
+    )
+    
+    search_start = time.perf_counter()
+    total, table = cached_view(data, 'duplicates', threshold, compute=lambda: duplicate_table(data, threshold))
+    search_ms = (time.perf_counter() - search_start) * 1000
+    
+    if total == 0:
+        st.info("No scenario pairs reach this similarity.")
+        return
+    
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    shown = f"the {len(table)} most similar of " if total > len(table) else ""
+    st.caption(f"Showing {shown}{total} pairs, found in {search_ms:.1f} ms")
+
+def render_dashboard(profiler):
+    """Render the dashboard for a logged-in user"""
+    # Add logout button in sidebar
+    with st.sidebar:
+        if st.session_state.get("auth_user"):
+            st.caption(f"Signed in as **{st.session_state['auth_user']}**")
+        if dashboard_auth.server_login_enabled():
+            # The logout route revokes the session token and clears the HttpOnly cookie
+            st.markdown(f'<a href="{dashboard_auth.LOGOUT_PATH}" target="_self">🚪 Logout</a>', unsafe_allow_html=True)
+        elif st.button("🚪 Logout"):
+            del st.session_state["password_correct"]
+            st.rerun()
+    
+    # Header
+    st.markdown('<h1 class="main-header"> Fraud Framework Priority Matrix</h1>', unsafe_allow_html=True)
+    
+    # Load data
+    profiler.mark("data load")
+    catalog_name = select_catalog()
+    data = load_data(catalog_name)
+    if data is None:
+        st.stop()
+    
+    # Let the session know when the catalog was reloaded underneath it
+    seen_versions = st.session_state.setdefault("data_versions", {})
+    seen_version = seen_versions.get(catalog_name)
+    if seen_version is not None and seen_version != data['version']:
+        st.toast(f"📥 '{catalog_name}' was updated; showing the latest version.")
+    seen_versions[catalog_name] = data['version']
+    
+    # Full-text search across the scenario narratives
+    profiler.mark("search")
+    search_query = st.text_input(
+        "🔎 Search scenarios",
+        key="search_query",
+        placeholder="e.g. chargeback, refund claim, bracketing..."
+    ).strip()
+    if search_query:
+        search_start = time.perf_counter()
+        result_rows, _ = cached_view(
+            data, 'search', search_query.lower(),
+            compute=lambda: data['search_index'].search(search_query, limit=SEARCH_RESULT_LIMIT)
+        )
+        search_ms = (time.perf_counter() - search_start) * 1000
+        
+        st.markdown(f"### 🔎 {len(result_rows)} scenarios matching *{html.escape(search_query)}*")
+        st.caption(f"Search took {search_ms:.1f} ms")
+        if len(result_rows) > 0:
+            display_scenario_page(data, result_rows, "search", search_query)
+        else:
+            st.info("No scenarios match your search. Try a shorter or different keyword.")
+        st.markdown("---")
+    
+    # Initialize session state for selected quadrant
+    if 'selected_quadrant' not in st.session_state:
+        st.session_state.selected_quadrant = None
+    
+    display_matrix_explorer(catalog_name, profiler)
+
+@st.fragment
+def display_category_analysis(catalog_name, profiler):
+    """Category heatmap, Key Insights and the combined view; reruns on its own when toggled"""
+    data = load_data(catalog_name, warn_stale=False)
+    if data is None:
+        return
+    profiler.mark("heatmap")
+    st.markdown("---")
+    st.markdown("## 📊 Category Analysis")
+    
+    # Create and display the heatmap
+    heatmap_json, category_matrix = load_category_heatmap(data)
+    show_figure(heatmap_json)
+    
+    # Add insights below the heatmap
+    profiler.mark("insights")
+    st.markdown("### 💡 Key Insights")
+    insights = load_category_insights(data, category_matrix)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total Categories", insights['total_categories'])
+    
+    with col2:
+        st.metric("Most Populated Priority", insights['most_common_quadrant'])
+    
+    with col3:
+        st.metric("Max Scenarios in Priority", insights['max_scenarios'])
+    
+    # Show category distribution insights
+    st.markdown("#### 🎯 Category Distribution Highlights:")
+    
+    insights_col1, insights_col2 = st.columns(2)
+    
+    # Each list is rendered as a single markdown block
+    with insights_col1:
+        top_categories = insights['top_categories']
+        st.markdown("\n".join(["**Top Categories by Priority Level:**", ""] + [
+            f"• **{quadrant}**: {category} ({count} scenarios)  "
+            for quadrant, category, count in top_categories.itertuples(index=False)
+        ]))
+    
+    with insights_col2:
+        category_spread = insights['category_spread']
+        st.markdown("\n".join(["**Category Spread Analysis:**", ""] + [
+            f"• **{category}**: {concentration:.0f}% in {quadrant}  "
+            for category, quadrant, concentration in category_spread.itertuples(index=False)
+        ]))
+    
+    # Combined view over every catalog, computed off the main process
+    catalogs = list_catalogs()
+    if len(catalogs) > 1 and st.toggle(f"🌍 Combine all {len(catalogs)} catalogs", key="combine_catalogs"):
+        profiler.mark("combined heatmap")
+        with st.spinner("Aggregating all catalogs..."):
+            combined_json, _, totals, errors = load_combined_heatmap(tuple(catalogs))
+        if combined_json is not None:
+            show_figure(combined_json)
+            st.caption(f"{sum(totals.values()):,} scenarios from " + ", ".join(
+                f"{name} ({count:,})" for name, count in sorted(totals.items())
+            ))
+        for name, error in sorted(errors.items()):
+            st.warning(f"'{name}' was left out of the combined view: {error}")
+
+def clear_selected_quadrant():
+    st.session_state.selected_quadrant = None
+
+@st.fragment
+def display_matrix_explorer(catalog_name, profiler):
+    """The quadrant matrix with either the selected quadrant's drill-down or the overview.
+
+    Runs as a fragment: a quadrant click (or going back) reruns only this part
+    of the page, not the login check, catalog selection and search above it.
+    """
+    data = load_data(catalog_name, warn_stale=False)
+    if data is None:
+        return
+    df = data['df']
+    quadrant_index = data['quadrant_index']
+    
+    # Display matrix overview
+    profiler.mark("matrix build")
+    st.markdown("<h3 style='text-align: center;'> Priority Matrix - Click on any quadrant to explore scenarios in detail</h3>", unsafe_allow_html=True)
+    
+    # Create matrix header with axes labels
+    st.markdown("""
+    <div style="text-align: center; margin: 20px 0;">
+        <div style="margin-bottom: 20px; font-weight: bold; color: #1f77b4; font-size: 18px;">
+            FEASIBILITY
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Add column headers for feasibility
+    header_col1, header_col2, header_col3, header_col4 = st.columns([0.25, 1, 1, 1])
+    with header_col1:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; font-size: 16px; 
+                    transform: rotate(-90deg); height: 80px; display: flex; align-items: center; 
+                    justify-content: center; margin-top: 40px;'>
+            BUSINESS VALUE
+        </div>
+        """, unsafe_allow_html=True)
+    with header_col2:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; 
+                    height: 60px; display: flex; align-items: center; justify-content: center; 
+                    font-size: 16px; background-color: #f8f9fa; border-radius: 8px; margin: 5px;'>
+            HIGH
+        </div>
+        """, unsafe_allow_html=True)
+    with header_col3:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; 
+                    height: 60px; display: flex; align-items: center; justify-content: center; 
+                    font-size: 16px; background-color: #f8f9fa; border-radius: 8px; margin: 5px;'>
+            MEDIUM
+        </div>
+        """, unsafe_allow_html=True)
+    with header_col4:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; 
+                    height: 60px; display: flex; align-items: center; justify-content: center; 
+                    font-size: 16px; background-color: #f8f9fa; border-radius: 8px; margin: 5px;'>
+            LOW
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Row 1: High Business Value
+    row1_col1, row1_col2, row1_col3, row1_col4 = st.columns([0.25, 1, 1, 1])
+    
+    with row1_col1:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; 
+                    height: 140px; display: flex; align-items: center; justify-content: center; 
+                    font-size: 16px; background-color: #f8f9fa; border-radius: 8px; margin: 5px;'>
+            HIGH
+        </div>
+        """, unsafe_allow_html=True)
+    
+    
+    with row1_col2:
+        quadrant = get_quadrant_info('High', 'High')
+        count = len(quadrant_index['High-High'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="high-high", help="High Business Value & High Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'High-High'
+    
+    with row1_col3:
+        quadrant = get_quadrant_info('High', 'Medium')
+        count = len(quadrant_index['High-Medium'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="high-medium", help="High Business Value & Medium Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'High-Medium'
+    
+    with row1_col4:
+        quadrant = get_quadrant_info('High', 'Low')
+        count = len(quadrant_index['High-Low'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="high-low", help="High Business Value & Low Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'High-Low'
+    
+    # Row 2: Medium Business Value
+    row2_col1, row2_col2, row2_col3, row2_col4 = st.columns([0.25, 1, 1, 1])
+    
+    with row2_col1:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; 
+                    height: 140px; display: flex; align-items: center; justify-content: center; 
+                    font-size: 16px; background-color: #f8f9fa; border-radius: 8px; margin: 5px;'>
+            MEDIUM
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with row2_col2:
+        quadrant = get_quadrant_info('Medium', 'High')
+        count = len(quadrant_index['Medium-High'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="medium-high", help="Medium Business Value & High Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'Medium-High'
+    
+    with row2_col3:
+        quadrant = get_quadrant_info('Medium', 'Medium')
+        count = len(quadrant_index['Medium-Medium'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="medium-medium", help="Medium Business Value & Medium Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'Medium-Medium'
+    
+    with row2_col4:
+        quadrant = get_quadrant_info('Medium', 'Low')
+        count = len(quadrant_index['Medium-Low'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="medium-low", help="Medium Business Value & Low Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'Medium-Low'
+    
+    # Row 3: Low Business Value (for completeness)
+    row3_col1, row3_col2, row3_col3, row3_col4 = st.columns([0.25, 1, 1, 1])
+    
+    with row3_col1:
+        st.markdown("""
+        <div style='text-align: center; font-weight: bold; color: #1f77b4; 
+                    height: 140px; display: flex; align-items: center; justify-content: center; 
+                    font-size: 16px; background-color: #f8f9fa; border-radius: 8px; margin: 5px;'>
+            LOW
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with row3_col2:
+        quadrant = get_quadrant_info('Low', 'High')
+        count = len(quadrant_index['Low-High'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="low-high", help="Low Business Value & High Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'Low-High'
+    
+    with row3_col3:
+        quadrant = get_quadrant_info('Low', 'Medium')
+        count = len(quadrant_index['Low-Medium'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="low-medium", help="Low Business Value & Medium Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'Low-Medium'
+    
+    with row3_col4:
+        quadrant = get_quadrant_info('Low', 'Low')
+        count = len(quadrant_index['Low-Low'])
+        button_text = f"{quadrant['icon']} **{quadrant['title']}**\n\n**{count}** scenarios\n\n{quadrant['description']}"
+        if st.button(button_text, key="low-low", help="Low Business Value & Low Feasibility", use_container_width=True):
+            st.session_state.selected_quadrant = 'Low-Low'
+    
+    # ADD CATEGORY HEATMAP SECTION HERE
+    if not st.session_state.selected_quadrant:
+        display_category_analysis(catalog_name, profiler)
+    
+    # Display selected quadrant details
+    if st.session_state.selected_quadrant:
+        profiler.mark("drill-down")
+        quadrant_rows = quadrant_index.get(st.session_state.selected_quadrant, [])
+        quadrant_info = get_quadrant_info(*st.session_state.selected_quadrant.split('-'))
+        
+        st.markdown("---")
+        st.markdown(f"## {quadrant_info['icon']} {quadrant_info['title']} - {len(quadrant_rows)} Scenarios")
+        st.markdown(f"*{quadrant_info['description']}*")
+        
+        # Display scenarios if any exist
+        if len(quadrant_rows) > 0:
+            display_scenario_page(data, quadrant_rows, "quadrant", st.session_state.selected_quadrant)
+        else:
+            # Display message when no scenarios exist
+            st.info(f"No scenarios currently exist in the {quadrant_info['title']} quadrant.")
+            st.markdown("### 💡 What this means:")
+            
+            bv, feas = st.session_state.selected_quadrant.split('-')
+            if bv == 'High' and feas == 'Low':
+                st.markdown("""
+                This quadrant would contain scenarios with:
+                - **High Business Value**: Significant impact on business operations
+                - **Low Feasibility**: Difficult or challenging to implement
+                
+                These scenarios typically require substantial resources or face significant technical/operational barriers.
+                """)
+            elif bv == 'Low' and feas == 'High':
+                st.markdown("""
+                This quadrant would contain scenarios with:
+                - **Low Business Value**: Limited impact on business operations  
+                - **High Feasibility**: Easy to implement
+                
+                These scenarios are typically quick fixes but may not provide significant business benefit.
+                """)
+            elif bv == 'Low' and feas == 'Low':
+                st.markdown("""
+                This quadrant would contain scenarios with:
+                - **Low Business Value**: Limited impact on business operations
+                - **Low Feasibility**: Difficult to implement
+                
+                These scenarios are generally not recommended for implementation due to poor cost-benefit ratio.
+                """)
+            else:
+                st.markdown(f"""
+                This quadrant is for scenarios with **{bv} Business Value** and **{feas} Feasibility**.
+                """)
+        
+        if len(quadrant_rows) > 0:
+            profiler.mark("export")
+            st.markdown("### 📤 Export")
+            quadrant_slug = quadrant_info['title'].lower().replace(' ', '-')
+            display_export(catalog_name, functools.partial(quadrant_rows_of, quadrant=st.session_state.selected_quadrant), st.session_state.selected_quadrant, f"fraud-scenarios-{quadrant_slug}")
+        
+        # Add a clear selection button at the bottom
+        st.button("🔙 Back to Matrix Overview", on_click=clear_selected_quadrant)
+    
+    else:
+        st.markdown("---")
+        profiler.mark("priority ranking")
+        display_priority_ranking(catalog_name)
+        
+        st.markdown("---")
+        profiler.mark("field coverage")
+        display_field_coverage(catalog_name)
+        
+        st.markdown("---")
+        profiler.mark("near duplicates")
+        display_near_duplicates(catalog_name)
+        
+        # Display summary statistics
+        profiler.mark("summary statistics")
+        st.markdown("---")
+        st.markdown("### 📈 Summary Statistics")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Scenarios", len(df))
+        
+        with col2:
+            high_bv_count = int((df['Business Value'] == 'High').sum())
+            st.metric("High Business Value", high_bv_count)
+        
+        with col3:
+            high_feas_count = int((df['Feasibility'] == 'High').sum())
+            st.metric("High Feasibility", high_feas_count)
+        
+        with col4:
+            quick_wins = len(quadrant_index['High-High'])
+            st.metric("Quick Wins", quick_wins)
+        
+        # Whole-matrix export, in matrix order
+        profiler.mark("export")
+        st.markdown("### 📤 Export All Scenarios")
+        display_export(catalog_name, matrix_order, "matrix", "fraud-scenarios")
+        
+        # Display matrix legend
+        st.markdown("### 🗺️ Matrix Legend")
+        legend_col1, legend_col2 = st.columns(2)
+        
+        with legend_col1:
+            st.markdown("""
+            **Quadrant Definitions:**
+            - 🎯 **Quick Wins**: High value, easy to implement
+            - 🚀 **Major Projects**: High value, moderate effort
+            - 🔧 **Fill-ins**: Medium value, easy to implement
+            """)
+        
+        with legend_col2:
+            st.markdown("""
+            **Assessment Criteria:**
+            - 🤔 **Consider Carefully**: Medium value & feasibility
+            - ⚠️ **Questionable**: Low feasibility scenarios
+            - 📊 **Data-Driven**: All assessments include detailed reasoning
+            """)
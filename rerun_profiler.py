@@ -0,0 +1,179 @@
+"""Per-rerun profiling of the dashboard script.
+
+Enabled with FRAUD_DASHBOARD_PROFILE=1 or the `?profile=1` query parameter.
+Each stage of a rerun records its wall time and the number of Streamlit
+elements (delta messages) it emitted. The breakdown is shown in the sidebar,
+logged as one JSON line per rerun and, when FRAUD_DASHBOARD_METRICS_FILE is
+set, accumulated into a Prometheus text-format file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE = os.environ.get('FRAUD_DASHBOARD_METRICS_FILE')
+
+# Process-wide totals across all sessions: stage -> [reruns, seconds, elements]
+_totals = {}
+# Latest value of each reported gauge: (group, name) -> value
+_gauges = {}
+_totals_lock = threading.Lock()
+
+
+def profiling_requested():
+    """True if profiling is switched on by environment variable or query parameter"""
+    if os.environ.get('FRAUD_DASHBOARD_PROFILE', '').lower() in ('1', 'true', 'yes'):
+        return True
+    try:
+        return st.query_params.get('profile', '').lower() in ('1', 'true', 'yes')
+    except Exception:
+        return False
+
+
+class RerunProfiler:
+    """Times consecutive stages of one script run and counts the elements each emits"""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.stages = []
+        self.elements = 0
+        self.gauge_groups = {}
+        self._current = None
+        self._started = time.perf_counter()
+        self._ctx = None
+        self._enqueue = None
+        if enabled:
+            self._count_elements()
+
+    @classmethod
+    def from_environment(cls):
+        return cls(profiling_requested())
+
+    def _count_elements(self):
+        # Wrap the run context's message queue; every delta is one element on the page
+        ctx = get_script_run_ctx()
+        if ctx is None or not hasattr(ctx, '_enqueue'):
+            return
+        original = ctx._enqueue
+
+        def counting_enqueue(msg):
+            if msg.WhichOneof('type') == 'delta':
+                self.elements += 1
+            original(msg)
+
+        self._ctx, self._enqueue = ctx, original
+        ctx._enqueue = counting_enqueue
+
+    def gauges(self, group, values):
+        """Attach point-in-time numbers (e.g. cache statistics) to this rerun"""
+        if self.enabled:
+            self.gauge_groups[group] = dict(values)
+
+    def mark(self, name):
+        """End the running stage (if any) and start timing `name`"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._close(now)
+        self._current = (name, now, self.elements)
+
+    def _close(self, now):
+        if self._current is not None:
+            name, started, elements = self._current
+            self.stages.append({
+                'stage': name,
+                'ms': round((now - started) * 1000, 3),
+                'elements': self.elements - elements
+            })
+            self._current = None
+
+    def finish(self):
+        """Close the last stage, restore the message queue and publish the breakdown"""
+        if not self.enabled:
+            return
+        self._close(time.perf_counter())
+        total_ms = round((time.perf_counter() - self._started) * 1000, 3)
+
+        self._render_sidebar(total_ms)
+        if self._ctx is not None:
+            self._ctx._enqueue = self._enqueue
+            self._ctx = None
+
+        ctx = get_script_run_ctx()
+        logger.info(json.dumps({
+            'event': 'rerun_profile',
+            'session': ctx.session_id if ctx is not None else None,
+            'total_ms': total_ms,
+            'elements': self.elements,
+            'stages': self.stages,
+            **self.gauge_groups
+        }))
+        _record(self.stages, self.gauge_groups)
+        # Fragment reruns call into the same profiler later; they are not profiled
+        self.enabled = False
+
+    def _render_sidebar(self, total_ms):
+        with st.sidebar:
+            st.markdown("### ⏱️ Rerun Profile")
+            st.dataframe(
+                [{'Stage': s['stage'], 'ms': s['ms'], 'Elements': s['elements']} for s in self.stages],
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption(f"Total {total_ms:.1f} ms, {self.elements} elements")
+            for group, values in self.gauge_groups.items():
+                st.caption(f"{group}: " + ", ".join(
+                    f"{name} {value:.2f}" if isinstance(value, float) else f"{name} {value}"
+                    for name, value in values.items()
+                ))
+
+
+def _record(stages, gauge_groups):
+    """Add one rerun to the process-wide totals and refresh the metrics file"""
+    with _totals_lock:
+        for group, values in gauge_groups.items():
+            for name, value in values.items():
+                _gauges[(group, name)] = value
+        for stage in stages:
+            totals = _totals.setdefault(stage['stage'], [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += stage['ms'] / 1000
+            totals[2] += stage['elements']
+        if METRICS_FILE:
+            _write_metrics(METRICS_FILE)
+
+
+def prometheus_metrics():
+    """Process-wide stage totals in Prometheus text exposition format"""
+    lines = [
+        '# HELP fraud_dashboard_stage_seconds Wall time spent per rerun stage.',
+        '# TYPE fraud_dashboard_stage_seconds summary',
+    ]
+    for stage, (count, seconds, _) in sorted(_totals.items()):
+        lines.append(f'fraud_dashboard_stage_seconds_sum{{stage="{stage}"}} {seconds:.6f}')
+        lines.append(f'fraud_dashboard_stage_seconds_count{{stage="{stage}"}} {count}')
+    lines += [
+        '# HELP fraud_dashboard_stage_elements_total Streamlit elements emitted per rerun stage.',
+        '# TYPE fraud_dashboard_stage_elements_total counter',
+    ]
+    for stage, (_, _, elements) in sorted(_totals.items()):
+        lines.append(f'fraud_dashboard_stage_elements_total{{stage="{stage}"}} {elements}')
+    for (group, name), value in sorted(_gauges.items()):
+        metric = f'fraud_dashboard_{group}_{name}'
+        lines.append(f'# TYPE {metric} gauge')
+        lines.append(f'{metric} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_metrics(path):
+    # Written atomically so a textfile collector never reads a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as handle:
+        handle.write(prometheus_metrics())
+    os.replace(tmp_path, path)
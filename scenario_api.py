@@ -0,0 +1,231 @@
+"""JSON API over the loaded catalogs, served in the same process as the dashboard.
+
+The routes read from `scenario_reload.shared_registry()`, the same catalog
+watchers and derived indexes the Streamlit sessions use, so the API adds no
+second copy of the data. Every response carries an ETag built from the
+catalog version and the request, plus the catalog's Last-Modified time;
+conditional requests are answered with 304 before any work is done.
+
+    GET /api/catalogs
+    GET /api/quadrants?catalog=<name>
+    GET /api/categories?catalog=<name>
+    GET /api/scenarios?catalog=<name>&quadrant=High-High&category=<name>&offset=0&limit=50
+    GET /api/search?catalog=<name>&q=refund+claim&limit=20
+
+Every route requires a valid session token from `dashboard_auth`, either the
+dashboard's session cookie or an `Authorization: Bearer <token>` header
+(tokens for scripts come from `python dashboard_auth.py issue-token <user>`).
+
+Mounted next to the dashboard by `app.py`.
+"""
+import email.utils
+import hashlib
+
+import numpy as np
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import dashboard_auth
+import scenario_data
+import scenario_reload
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class ApiError(Exception):
+    """A client error reported as a JSON body with an HTTP status"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+def _int_param(request, name, default, minimum=0, maximum=None):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an integer")
+    if maximum is None and value < minimum:
+        raise ApiError(400, f"'{name}' must be at least {minimum}")
+    if maximum is not None and not minimum <= value <= maximum:
+        raise ApiError(400, f"'{name}' must be between {minimum} and {maximum}")
+    return value
+
+
+def _authenticate(request):
+    """User name of the request's session token (bearer header or dashboard cookie)"""
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'bearer':
+        token = request.cookies.get(dashboard_auth.COOKIE_NAME)
+    username = dashboard_auth.verify_token(token.strip() if token else None)
+    if username is None:
+        raise ApiError(401, "A valid session token is required", {'WWW-Authenticate': 'Bearer'})
+    return username
+
+
+def _error_response(error):
+    return JSONResponse({'error': str(error)}, status_code=error.status, headers=error.headers)
+
+
+def _catalog(request):
+    """(catalog name, watcher, dataset) for the request's `catalog` parameter"""
+    name = request.query_params.get('catalog', scenario_reload.DEFAULT_CATALOG)
+    registry = scenario_reload.shared_registry()
+    if name not in registry.catalogs():
+        raise ApiError(404, f"Unknown catalog '{name}'")
+    try:
+        watcher = registry.get(name)
+        return name, watcher, watcher.get()
+    except FileNotFoundError:
+        raise ApiError(404, f"Unknown catalog '{name}'")
+    except ValueError as e:
+        raise ApiError(503, f"'{name}' failed schema validation: {e}")
+
+
+def _records(df, rows):
+    """JSON-ready records of `rows`, with missing values as null"""
+    page = df.iloc[rows].astype(object)
+    page = page.where(page.notna(), None)
+    return [{column: _plain(value) for column, value in record.items()} for record in page.to_dict('records')]
+
+
+def _plain(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _validators(request, version, modified):
+    """(ETag, Last-Modified) of the response to `request` for one catalog version"""
+    query = '&'.join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha256(f"{version}|{request.url.path}|{query}".encode()).hexdigest()[:32]
+    last_modified = email.utils.formatdate(modified, usegmt=True) if modified is not None else None
+    return f'"{digest}"', last_modified
+
+
+def _not_modified(request, etag, modified):
+    """True when the client's cached copy is still current"""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag in tags or '*' in tags
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is not None and modified is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(modified) <= since
+    return False
+
+
+def catalog_endpoint(build):
+    """Wrap `build(request, data)` with catalog lookup, conditional GET and error handling"""
+    def endpoint(request):
+        try:
+            _authenticate(request)
+            name, watcher, data = _catalog(request)
+            etag, last_modified = _validators(request, data['version'], watcher.modified)
+            # Per-user data: shared caches must not store it
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+            if last_modified is not None:
+                headers['Last-Modified'] = last_modified
+            if _not_modified(request, etag, watcher.modified):
+                return Response(status_code=304, headers=headers)
+
+            body = build(request, data)
+            body.update(catalog=name, version=data['version'])
+            return JSONResponse(body, headers=headers)
+        except ApiError as e:
+            return _error_response(e)
+    endpoint.__name__ = build.__name__
+    return endpoint
+
+
+def list_catalogs(request):
+    try:
+        _authenticate(request)
+    except ApiError as e:
+        return _error_response(e)
+    registry = scenario_reload.shared_registry()
+    loaded = set(registry.loaded())
+    return JSONResponse({
+        'default': scenario_reload.DEFAULT_CATALOG,
+        'catalogs': [{'name': name, 'loaded': name in loaded} for name in registry.catalogs()],
+    })
+
+
+@catalog_endpoint
+def quadrants(request, data):
+    """Scenario count per quadrant, as shown on the matrix buttons"""
+    return {'quadrants': [
+        {'key': key, 'name': name, 'count': len(data['quadrant_index'][key])}
+        for key, name in scenario_data.QUADRANT_NAMES.items()
+    ]}
+
+
+@catalog_endpoint
+def categories(request, data):
+    """Category x quadrant crosstab behind the heatmap"""
+    matrix = scenario_data.trim_category_matrix(data['category_counts'])
+    return {
+        'categories': [str(c) for c in matrix.index],
+        'quadrants': [str(q) for q in matrix.columns],
+        'counts': matrix.to_numpy().tolist(),
+    }
+
+
+@catalog_endpoint
+def scenarios(request, data):
+    """One page of scenario records, optionally limited to a quadrant and/or category"""
+    df = data['df']
+    quadrant = request.query_params.get('quadrant')
+    category = request.query_params.get('category')
+    offset = _int_param(request, 'offset', 0)
+    limit = _int_param(request, 'limit', DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+
+    if quadrant is not None:
+        if quadrant not in data['quadrant_index']:
+            raise ApiError(400, f"'quadrant' must be one of {', '.join(scenario_data.QUADRANT_NAMES)}")
+        rows = data['quadrant_index'][quadrant]
+    else:
+        rows = np.arange(len(df))
+    if category is not None:
+        rows = rows[np.asarray(df['Category'].iloc[rows].astype(str) == category)]
+
+    return {
+        'total': len(rows),
+        'offset': offset,
+        'limit': limit,
+        'scenarios': _records(df, rows[offset:offset + limit]),
+    }
+
+
+@catalog_endpoint
+def search(request, data):
+    """Ranked full-text search over the scenario narratives"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        raise ApiError(400, "'q' is required")
+    limit = _int_param(request, 'limit', DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+    rows, scores = data['search_index'].search(query, limit=limit)
+    records = _records(data['df'], rows)
+    for record, score in zip(records, scores):
+        record['score'] = round(float(score), 4)
+    return {'query': query, 'total': len(records), 'scenarios': records}
+
+
+def routes():
+    """Routes to mount alongside the Streamlit app"""
+    return [
+        Route('/api/catalogs', list_catalogs),
+        Route('/api/quadrants', quadrants),
+        Route('/api/categories', categories),
+        Route('/api/scenarios', scenarios),
+        Route('/api/search', search),
+    ]
@@ -0,0 +1,184 @@
+"""Derived views of a catalog version: quadrant index, category counts, search and similarity indexes.
+
+Everything here is independent of Streamlit so the same dataset can be built
+by the dashboard, the background reloader and offline tooling.
+"""
+import numpy as np
+import pandas as pd
+
+import scenario_fields
+import scenario_scoring
+import scenario_search
+import scenario_similarity
+import scenario_store
+
+# Rating levels in display order (rows/columns of the priority matrix)
+RATING_LEVELS = ['High', 'Medium', 'Low']
+
+# Descriptive quadrant names, in the same row-major order as the matrix
+QUADRANT_NAMES = {
+    'High-High': '🎯 Quick Wins',
+    'High-Medium': '🚀 Major Projects',
+    'High-Low': '⛰️ Challenges',
+    'Medium-High': '🔧 Fill-ins',
+    'Medium-Medium': '🤔 Consider Carefully',
+    'Medium-Low': '⚠️ Questionable',
+    'Low-High': '🎈 Easy Wins',
+    'Low-Medium': '🔍 Reconsider',
+    'Low-Low': '❌ Avoid'
+}
+
+
+def quadrant_codes(df):
+    """Encode each row's quadrant as an integer (row-major matrix position, -1 if unrated)"""
+    bv_codes = pd.Categorical(df['Business Value'], categories=RATING_LEVELS).codes
+    feas_codes = pd.Categorical(df['Feasibility'], categories=RATING_LEVELS).codes
+    return np.where(
+        (bv_codes >= 0) & (feas_codes >= 0),
+        bv_codes * len(RATING_LEVELS) + feas_codes,
+        -1
+    )
+
+
+def quadrant_labels(codes):
+    """Descriptive quadrant names for an array of quadrant codes"""
+    return pd.Categorical.from_codes(codes, categories=list(QUADRANT_NAMES.values()))
+
+
+def build_quadrant_index(codes):
+    """Map every 'Business Value-Feasibility' key to the row positions it contains"""
+    # One groupby pass yields the row positions for every quadrant present
+    positions = pd.Series(codes).groupby(codes).indices
+    empty = np.empty(0, dtype=np.intp)
+
+    return {
+        key: positions.get(code, empty)
+        for code, key in enumerate(QUADRANT_NAMES)
+    }
+
+
+def category_counts(df):
+    """Scenario counts by Category (rows) and every quadrant (columns), zeros included"""
+    quadrants = df['Quadrant'] if 'Quadrant' in df.columns else quadrant_labels(quadrant_codes(df))
+    counts = pd.crosstab(
+        np.asarray(df['Category'].astype(object).fillna(scenario_store.UNCATEGORIZED).astype(str)),
+        np.asarray(pd.Series(quadrants, dtype=object))
+    )
+    counts = counts.reindex(columns=list(QUADRANT_NAMES.values()), fill_value=0)
+    counts.index.name = 'Category'
+    counts.columns.name = 'Quadrant'
+    return counts
+
+
+def trim_category_matrix(counts):
+    """Drop categories and quadrants that hold no scenarios"""
+    return counts.loc[counts.sum(axis=1) > 0, counts.sum() > 0]
+
+
+def _plain_quadrant_name(name):
+    """Quadrant name without its leading emoji"""
+    return name.split(' ', 1)[1] if ' ' in name else name
+
+
+def category_insights(category_matrix):
+    """Key Insights of a category x quadrant count matrix, computed in one NumPy pass"""
+    values = category_matrix.to_numpy()
+    quadrants = np.asarray(category_matrix.columns, dtype=object)
+    categories = np.asarray(category_matrix.index, dtype=object)
+    if values.size == 0:
+        return {
+            'total_categories': len(categories),
+            'most_common_quadrant': '-',
+            'max_scenarios': 0,
+            'top_categories': pd.DataFrame(columns=['Priority Level', 'Top Category', 'Scenarios']),
+            'category_spread': pd.DataFrame(columns=['Category', 'Primary Priority', 'Concentration'])
+        }
+
+    quadrant_totals = values.sum(axis=0)
+    category_totals = values.sum(axis=1)
+
+    # Top category per quadrant (columns) and primary quadrant per category (rows)
+    top_category = values.argmax(axis=0)
+    primary_quadrant = values.argmax(axis=1)
+    primary_count = values[np.arange(len(categories)), primary_quadrant]
+    concentration = np.divide(
+        primary_count * 100.0, category_totals,
+        out=np.zeros(len(categories)), where=category_totals > 0
+    )
+
+    populated = quadrant_totals > 0
+    busiest = quadrant_totals.argmax()
+    return {
+        'total_categories': len(categories),
+        'most_common_quadrant': _plain_quadrant_name(quadrants[busiest]),
+        'max_scenarios': int(quadrant_totals[busiest]),
+        'top_categories': pd.DataFrame({
+            'Priority Level': quadrants[populated],
+            'Top Category': categories[top_category[populated]],
+            'Scenarios': values[top_category, np.arange(len(quadrants))][populated]
+        }),
+        'category_spread': pd.DataFrame({
+            'Category': categories,
+            'Primary Priority': [_plain_quadrant_name(q) for q in quadrants[primary_quadrant]],
+            'Concentration': concentration
+        })
+    }
+
+
+def build_dataset(df, version):
+    """Compute every derived view of one catalog version"""
+    codes = quadrant_codes(df)
+
+    # Derived columns are computed once here instead of on every rerun
+    df['Quadrant'] = quadrant_labels(codes)
+
+    return {
+        'version': version,
+        'df': df,
+        'quadrant_codes': codes,
+        'quadrant_index': build_quadrant_index(codes),
+        'category_counts': category_counts(df),
+        'search_index': scenario_search.build_search_index(df),
+        'field_index': scenario_fields.build_field_index(df),
+        'priority_index': scenario_scoring.build_priority_index(df),
+        'similarity_index': scenario_similarity.build_similarity_index(df)
+    }
+
+
+def update_dataset(previous, df, version):
+    """Derive the views of a new catalog version from the previous one.
+
+    Rows are matched by (Category, Scenario); only added or edited rows are
+    re-encoded, re-tokenized and re-hashed, and removed rows are subtracted
+    from the category counts.
+    """
+    position_map, changed_rows = scenario_store.diff_catalog(previous['df'].drop(columns='Quadrant'), df)
+    kept = position_map >= 0
+
+    codes = np.full(len(df), -1, dtype=previous['quadrant_codes'].dtype)
+    codes[position_map[kept]] = previous['quadrant_codes'][kept]
+    codes[changed_rows] = quadrant_codes(df.iloc[changed_rows])
+    df['Quadrant'] = quadrant_labels(codes)
+
+    removed = previous['df'].iloc[np.flatnonzero(~kept)]
+    counts = (
+        previous['category_counts']
+        .sub(category_counts(removed), fill_value=0)
+        .add(category_counts(df.iloc[changed_rows]), fill_value=0)
+        .astype(int)
+        .sort_index()
+    )
+    counts = counts.loc[counts.sum(axis=1) > 0]
+
+    return {
+        'version': version,
+        'df': df,
+        'quadrant_codes': codes,
+        'quadrant_index': build_quadrant_index(codes),
+        'category_counts': counts,
+        'search_index': previous['search_index'].apply_changes(position_map, df, changed_rows),
+        'field_index': previous['field_index'].apply_changes(position_map, df, changed_rows),
+        # Integer-coded and vectorised: cheaper to rebuild than to patch
+        'priority_index': scenario_scoring.build_priority_index(df),
+        'similarity_index': previous['similarity_index'].apply_changes(position_map, df, changed_rows)
+    }
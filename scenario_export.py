@@ -0,0 +1,271 @@
+"""Background export of scenario lists to CSV, XLSX and PDF files.
+
+Exports run on a small process-wide thread pool so building a large file never
+blocks a script rerun. Files are written in chunks to a temporary path and
+renamed into place when complete; the final path depends only on the catalog,
+its data version, the exported scope and the format, so a finished export is
+reused by every later request (and across restarts) until the catalog changes.
+Once a new version of a catalog is seen, the files and jobs of its older
+versions are removed.
+
+XLSX needs `openpyxl` and PDF needs `reportlab`; formats whose library is not
+installed are simply not offered.
+"""
+import csv
+import importlib.util
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = '.scenario_exports'
+
+# Rows written between progress updates
+CHUNK_ROWS = 500
+
+# Format -> (file extension, MIME type, module it needs)
+FORMATS = {
+    'CSV': ('csv', 'text/csv', None),
+    'XLSX': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'openpyxl'),
+    'PDF': ('pdf', 'application/pdf', 'reportlab'),
+}
+
+
+def available_formats():
+    """Export formats whose writer library is installed"""
+    return [
+        name for name, (_, _, module) in FORMATS.items()
+        if module is None or importlib.util.find_spec(module) is not None
+    ]
+
+
+def _cell(value):
+    """Plain text of a cell; missing values become empty strings"""
+    if value is None or pd.isna(value):
+        return ''
+    return str(value)
+
+
+def _plain_label(label):
+    """Section label without its leading emoji (PDF fonts cannot draw them)"""
+    return re.sub(r'^[^\w(]+', '', label).strip()
+
+
+class ExportJob:
+    """Progress and outcome of one export; updated by the worker thread"""
+
+    def __init__(self, path, total):
+        self.path = path
+        self.total = total
+        self.done = 0
+        self.saving = False
+        self.error = None
+        self.finished = threading.Event()
+
+    @property
+    def progress(self):
+        if self.finished.is_set() or not self.total:
+            return 1.0
+        # The last step (writing the file out) is reported separately via `saving`
+        return min(self.done / self.total, 0.99)
+
+
+class ExportManager:
+    """Runs exports on a bounded thread pool and reuses finished files by data version"""
+
+    def __init__(self, directory=EXPORT_DIR, max_workers=2):
+        self.directory = directory
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scenario-export')
+        self._jobs = {}
+        # Catalog -> (current version, versions it replaced)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, catalog, version, scope, fmt):
+        extension = FORMATS[fmt][0]
+        safe_scope = re.sub(r'[^A-Za-z0-9_-]+', '_', scope)
+        return os.path.join(self._catalog_dir(catalog), f"{version[:16]}-{safe_scope}.{extension}")
+
+    def _catalog_dir(self, catalog):
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9_.-]+', '_', catalog))
+
+    def submit(self, catalog, data, rows, scope, fmt, sections):
+        """Start (or join) the export of `rows` of one catalog version and return its job.
+
+        `sections` lists the card content to export as (label, column,
+        reason column or None) tuples; the first one is the scenario title.
+        """
+        path = self.path_for(catalog, data['version'], scope, fmt)
+        with self._lock:
+            self._prune(catalog, data['version'])
+            job = self._existing_job(path)
+            if job is not None and job.error is None:
+                return job
+
+            job = ExportJob(path, len(rows))
+            self._jobs[path] = job
+
+        self._pool.submit(self._run, job, data['df'], rows, fmt, sections)
+        return job
+
+    def job(self, catalog, version, scope, fmt):
+        """The job for an export that was already submitted or finished, if any"""
+        with self._lock:
+            self._prune(catalog, version)
+            return self._existing_job(self.path_for(catalog, version, scope, fmt))
+
+    def _prune(self, catalog, version):
+        """Drop the files and jobs of a catalog's other versions the first time `version` is seen"""
+        current, replaced = self._versions.get(catalog, (None, set()))
+        # Sessions still showing a replaced version must not prune the current one
+        if version == current or version in replaced:
+            return
+        if current is not None:
+            replaced.add(current)
+        self._versions[catalog] = (version, replaced)
+
+        directory = self._catalog_dir(catalog)
+        keep = f"{version[:16]}-"
+        running = {path for path, job in self._jobs.items() if not job.finished.is_set()}
+        for path, job in list(self._jobs.items()):
+            if os.path.dirname(path) == directory and not os.path.basename(path).startswith(keep) and path not in running:
+                del self._jobs[path]
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            # Temporary files of running exports are removed by their own job
+            final_path = path[:-len('.tmp')].rsplit('.', 1)[0] if name.endswith('.tmp') else path
+            if name.startswith(keep) or final_path in running:
+                continue
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning("Could not remove old export %s: %s", path, e)
+
+    def _existing_job(self, path):
+        job = self._jobs.get(path)
+        if job is None and os.path.exists(path):
+            # Finished by an earlier process for this data version
+            job = ExportJob(path, 0)
+            job.finished.set()
+            self._jobs[path] = job
+        return job
+
+    def _run(self, job, df, rows, fmt, sections):
+        os.makedirs(os.path.dirname(job.path), exist_ok=True)
+        tmp_path = f"{job.path}.{threading.get_ident()}.tmp"
+        try:
+            writer = {'CSV': _write_csv, 'XLSX': _write_xlsx, 'PDF': _write_pdf}[fmt]
+            writer(tmp_path, job, df, rows, sections)
+            os.replace(tmp_path, job.path)
+        except Exception as e:
+            job.error = e
+            logger.warning("Export to %s failed: %s", job.path, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        finally:
+            job.finished.set()
+
+
+def _header(sections):
+    header = []
+    for label, column, reason_column in sections:
+        header.append(_plain_label(label))
+        if reason_column is not None:
+            header.append(f"{_plain_label(label)} Reason")
+    return header
+
+
+def _chunks(job, df, rows, sections):
+    """Yield the export rows in chunks of CHUNK_ROWS, advancing the job's progress"""
+    columns = [column for _, column, _ in sections] + [r for _, _, r in sections if r is not None]
+    columns = [c for c in dict.fromkeys(columns) if c in df.columns]
+    for start in range(0, len(rows), CHUNK_ROWS):
+        chunk = df.iloc[rows[start:start + CHUNK_ROWS]][columns]
+        records = []
+        for record in chunk.to_dict('records'):
+            values = []
+            for _, column, reason_column in sections:
+                values.append(_cell(record.get(column)))
+                if reason_column is not None:
+                    values.append(_cell(record.get(reason_column)))
+            records.append(values)
+        yield records
+        job.done = min(start + CHUNK_ROWS, len(rows))
+
+
+def _write_csv(path, job, df, rows, sections):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(_header(sections))
+        for records in _chunks(job, df, rows, sections):
+            writer.writerows(records)
+
+
+def _write_xlsx(path, job, df, rows, sections):
+    from openpyxl import Workbook
+
+    # Write-only mode streams rows to disk instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Scenarios')
+    sheet.append(_header(sections))
+    for records in _chunks(job, df, rows, sections):
+        for record in records:
+            sheet.append(record)
+    workbook.save(path)
+
+
+class _ChunkedStory(list):
+    """Flowable list that refills itself from `chunks` whenever the document template empties it"""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = chunks
+
+    def __len__(self):
+        if not super().__len__():
+            self.extend(next(self._chunks, ()))
+        return super().__len__()
+
+
+def _write_pdf(path, job, df, rows, sections):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+    styles = getSampleStyleSheet()
+    labels = [escape(_plain_label(label)) for label, _, _ in sections]
+
+    def flowables():
+        # One chunk of scenarios at a time is turned into flowables and laid out,
+        # so the job's progress follows the layout instead of running ahead of it
+        for records in _chunks(job, df, rows, sections):
+            story = []
+            for record in records:
+                # One page per scenario, laid out like its dashboard card
+                values = iter(record)
+                for i, ((_, _, reason_column), label) in enumerate(zip(sections, labels)):
+                    value = escape(next(values))
+                    if reason_column is not None:
+                        reason = escape(next(values))
+                        value = f"<b>{value}</b><br/>{reason}" if reason else f"<b>{value}</b>"
+                    if i == 0:
+                        story.append(Paragraph(value, styles['Heading2']))
+                    else:
+                        story.append(Paragraph(f"<b>{label}:</b> {value}", styles['BodyText']))
+                story.append(PageBreak())
+            yield story
+        job.saving = True
+
+    # Compressed pages keep the laid-out document small until it is written out
+    document = SimpleDocTemplate(path, pagesize=A4, title='Fraud Scenarios', pageCompression=1)
+    document.build(_ChunkedStory(flowables()))
@@ -0,0 +1,119 @@
+"""Inverted index from warehouse data fields to the scenarios that need them.
+
+The comma-separated `Data Fields` column is parsed once per data version into
+one packed bitset per field (bit i set = scenario i needs the field), which
+turns "what can we run with these fields" into a handful of vectorised
+bitset operations.
+"""
+import numpy as np
+import pandas as pd
+
+FIELDS_COLUMN = 'Data Fields'
+
+
+def parse_fields(value):
+    """Split a `Data Fields` cell into normalised field names"""
+    if value is None or pd.isna(value):
+        return []
+    return [field.strip().lower() for field in str(value).split(',') if field.strip()]
+
+
+class FieldIndex:
+    """Field -> scenario bitsets with subset-coverage queries"""
+
+    def __init__(self, fields, field_bits, required_counts):
+        self.fields = fields
+        self.field_ids = {field: i for i, field in enumerate(fields)}
+        # (n_fields, ceil(n_scenarios / 8)) packed bitsets
+        self.field_bits = field_bits
+        # Number of distinct fields each scenario needs
+        self.required_counts = required_counts
+
+    def __len__(self):
+        return len(self.required_counts)
+
+    def covered_counts(self, available_fields):
+        """Per scenario, how many of its required fields are in `available_fields`"""
+        ids = sorted({
+            self.field_ids[field]
+            for field in (f.strip().lower() for f in available_fields)
+            if field in self.field_ids
+        })
+        if not ids:
+            return np.zeros(len(self), dtype=np.int64)
+        bits = np.unpackbits(self.field_bits[ids], axis=1, count=len(self))
+        return bits.sum(axis=0, dtype=np.int64)
+
+    def coverage(self, available_fields, include_partial=True):
+        """Scenarios runnable with `available_fields`, best covered first.
+
+        Returns a DataFrame indexed by row position with covered/required
+        field counts and the coverage ratio. Scenarios without any listed
+        fields are left out.
+        """
+        covered = self.covered_counts(available_fields)
+        required = self.required_counts
+        mask = (required > 0) & (covered > 0 if include_partial else covered == required)
+        rows = np.flatnonzero(mask)
+
+        result = pd.DataFrame({
+            'covered': covered[rows],
+            'required': required[rows],
+            'coverage': covered[rows] / required[rows],
+        }, index=pd.Index(rows, name='position'))
+        return result.sort_values(['coverage', 'covered'], ascending=False, kind='stable')
+
+    def apply_changes(self, position_map, df, changed_rows, column=FIELDS_COLUMN):
+        """Return an index for a new version of the catalog, re-parsing only `changed_rows`.
+
+        `position_map[old_position]` is the row's position in `df`, or -1 if
+        the row was removed or changed.
+        """
+        n_scenarios = len(df)
+        changed_rows = np.asarray(changed_rows, dtype=np.intp)
+        delta = build_field_index(df.iloc[changed_rows], column)
+
+        fields = sorted(set(self.fields) | set(delta.fields))
+        field_bits = np.zeros((len(fields), (n_scenarios + 7) // 8), dtype=np.uint8)
+        kept = np.flatnonzero(position_map >= 0)
+        new_positions = position_map[kept]
+
+        for field_id, field in enumerate(fields):
+            bits = np.zeros(n_scenarios, dtype=bool)
+            old_id = self.field_ids.get(field)
+            if old_id is not None:
+                old_bits = np.unpackbits(self.field_bits[old_id], count=len(self)).astype(bool)
+                bits[new_positions] = old_bits[kept]
+            delta_id = delta.field_ids.get(field)
+            if delta_id is not None:
+                bits[changed_rows] |= np.unpackbits(delta.field_bits[delta_id], count=len(delta)).astype(bool)
+            field_bits[field_id] = np.packbits(bits)
+
+        required_counts = np.zeros(n_scenarios, dtype=np.int64)
+        required_counts[new_positions] = self.required_counts[kept]
+        required_counts[changed_rows] = delta.required_counts
+
+        # Drop fields no scenario references any more
+        used = field_bits.any(axis=1)
+        return FieldIndex([f for f, u in zip(fields, used) if u], field_bits[used], required_counts)
+
+
+def build_field_index(df, column=FIELDS_COLUMN):
+    """Parse the Data Fields column of every row and build a FieldIndex"""
+    n_scenarios = len(df)
+    if column not in df.columns:
+        return FieldIndex([], np.zeros((0, (n_scenarios + 7) // 8), dtype=np.uint8), np.zeros(n_scenarios, dtype=np.int64))
+
+    # One (row position, field) pair per distinct field a scenario needs
+    pairs = df[column].reset_index(drop=True).map(parse_fields).explode().dropna()
+    pairs = pd.DataFrame({'row': pairs.index.to_numpy(dtype=np.intp), 'field': pairs.to_numpy()}).drop_duplicates()
+
+    field_codes, fields = pd.factorize(pairs['field'], sort=True)
+    rows = pairs['row'].to_numpy()
+
+    # Set bit `row` of each field's bitset directly in packed (big-endian bit order) form
+    field_bits = np.zeros((len(fields), (n_scenarios + 7) // 8), dtype=np.uint8)
+    np.bitwise_or.at(field_bits, (field_codes, rows >> 3), (128 >> (rows & 7)).astype(np.uint8))
+
+    required_counts = np.bincount(rows, minlength=n_scenarios).astype(np.int64)
+    return FieldIndex(list(fields), field_bits, required_counts)
@@ -0,0 +1,217 @@
+"""Shared, read-only data plane for serving a catalog from several processes.
+
+On its own every dashboard process builds the derived views of a catalog
+(quadrant index, search postings, field bitsets, category counts, similarity
+signatures) in its own memory. With FRAUD_DASHBOARD_DATA_PLANE=1 each catalog version is built once,
+by whichever process sees it first, and published next to the Arrow store as
+an immutable directory of uncompressed .npy arrays plus a hard link to the
+Arrow file. Every process memory-maps those files, so the OS holds one copy of
+the data however many replicas attach:
+
+    FRAUD_DASHBOARD_DATA_PLANE=1 streamlit run fraud_dashboard.py --server.port 8501 &
+    FRAUD_DASHBOARD_DATA_PLANE=1 streamlit run fraud_dashboard.py --server.port 8502 &
+
+A counter file records the latest published version and is bumped on every
+publication. Watchers only compare it (and the CSV's stat) on each poll, so a
+reload published by one process is picked up by all of them. Publishing is
+serialised with an exclusive file lock (POSIX only).
+"""
+import contextlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import scenario_data
+import scenario_fields
+import scenario_scoring
+import scenario_search
+import scenario_similarity
+import scenario_store
+
+try:
+    import fcntl
+except ImportError:  # Windows: publications are not serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FILE = 'counter.json'
+VIEWS_FILE = 'views.json'
+ARROW_FILE = 'catalog.arrow'
+
+# Arrays stored per published version, each memory-mapped when attached
+VIEW_ARRAYS = [
+    'quadrant_codes', 'quadrant_rows', 'quadrant_offsets',
+    'category_counts',
+    'search_terms', 'search_offsets', 'search_docs', 'search_tfs', 'search_doc_lengths',
+    'field_bits', 'field_required',
+    'priority_combo_ids',
+    'similarity_signatures',
+]
+
+
+def plane_dir(csv_path):
+    """Directory holding the published versions of a CSV catalog"""
+    arrow_path, _ = scenario_store.store_paths(csv_path)
+    return os.path.splitext(arrow_path)[0] + '.plane'
+
+
+def read_counter(csv_path):
+    """(publication counter, catalog version) of the latest published version"""
+    try:
+        with open(os.path.join(plane_dir(csv_path), COUNTER_FILE)) as handle:
+            state = json.load(handle)
+        return state['counter'], state['version']
+    except (FileNotFoundError, ValueError, KeyError):
+        return 0, None
+
+
+@contextlib.contextmanager
+def _publish_lock(directory):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'lock'), 'w') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        # Released when the file is closed
+        yield
+
+
+def publish(csv_path, previous=None):
+    """Make sure the CSV's current version is published and return (counter, version).
+
+    Only the first process to see a new version builds it; `previous`, the
+    dataset the caller already holds, lets that build be incremental.
+    """
+    directory = plane_dir(csv_path)
+    with _publish_lock(directory):
+        version = scenario_store.ensure_store(csv_path)
+        counter, published = read_counter(csv_path)
+        if published == version and _is_complete(os.path.join(directory, version[:16])):
+            return counter, version
+
+        df = scenario_store.open_store(csv_path)
+        if previous is None:
+            data = scenario_data.build_dataset(df, version)
+        else:
+            data = scenario_data.update_dataset(previous, df, version)
+        _write_version(csv_path, directory, data)
+
+        counter += 1
+        tmp_path = os.path.join(directory, f"{COUNTER_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as handle:
+            json.dump({'counter': counter, 'version': version}, handle)
+        os.replace(tmp_path, os.path.join(directory, COUNTER_FILE))
+
+        # Processes still attached to the previous version keep their mappings
+        # after the files are unlinked; older ones are no longer attached
+        keep = {version[:16], published[:16] if published else None}
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.isdir(path) and name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+        logger.info("Published %s version %s as #%d", csv_path, version[:8], counter)
+        return counter, version
+
+
+def _is_complete(version_dir):
+    """True if a version directory holds every view array (older releases wrote fewer)"""
+    return all(os.path.exists(os.path.join(version_dir, f"{name}.npy")) for name in VIEW_ARRAYS)
+
+
+def _write_version(csv_path, directory, data):
+    """Write one dataset as an immutable version directory, swapped in when complete"""
+    target = os.path.join(directory, data['version'][:16])
+    staging = f"{target}.building-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        # The Arrow store is replaced on the next CSV edit; a link keeps this version's rows
+        arrow_path, _ = scenario_store.store_paths(csv_path)
+        try:
+            os.link(arrow_path, os.path.join(staging, ARROW_FILE))
+        except OSError:
+            shutil.copyfile(arrow_path, os.path.join(staging, ARROW_FILE))
+
+        search_index = data['search_index']
+        postings = search_index.postings
+        if isinstance(postings, scenario_search.PackedPostings):
+            terms, offsets, docs, tfs = postings.terms, postings.offsets, postings.docs, postings.tfs
+        else:
+            terms, offsets, docs, tfs = scenario_search.pack_postings(postings)
+
+        quadrant_index = data['quadrant_index']
+        counts = data['category_counts']
+        field_index = data['field_index']
+        arrays = {
+            'quadrant_codes': data['quadrant_codes'],
+            'quadrant_rows': np.concatenate([quadrant_index[key] for key in scenario_data.QUADRANT_NAMES]).astype(np.intp),
+            'quadrant_offsets': np.cumsum([0] + [len(quadrant_index[key]) for key in scenario_data.QUADRANT_NAMES]),
+            'category_counts': counts.to_numpy(dtype=np.int64),
+            'search_terms': terms,
+            'search_offsets': offsets,
+            'search_docs': docs,
+            'search_tfs': tfs,
+            'search_doc_lengths': search_index.doc_lengths,
+            'field_bits': field_index.field_bits,
+            'field_required': field_index.required_counts,
+            'priority_combo_ids': data['priority_index'].combo_ids,
+            'similarity_signatures': data['similarity_index'].signatures,
+        }
+        for name, values in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), np.asarray(values))
+        with open(os.path.join(staging, VIEWS_FILE), 'w') as handle:
+            json.dump({
+                'version': data['version'],
+                'categories': [str(c) for c in counts.index],
+                'quadrants': [str(q) for q in counts.columns],
+                'fields': list(field_index.fields),
+            }, handle)
+
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def attach(csv_path, version):
+    """Dataset of a published version, backed by the shared memory-mapped files"""
+    directory = os.path.join(plane_dir(csv_path), version[:16])
+    with open(os.path.join(directory, VIEWS_FILE)) as handle:
+        views = json.load(handle)
+    arrays = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+        for name in VIEW_ARRAYS
+    }
+
+    df = scenario_store.read_arrow(os.path.join(directory, ARROW_FILE))
+    codes = arrays['quadrant_codes']
+    df['Quadrant'] = scenario_data.quadrant_labels(codes)
+
+    rows, offsets = arrays['quadrant_rows'], arrays['quadrant_offsets']
+    counts = pd.DataFrame(
+        arrays['category_counts'],
+        index=pd.Index(views['categories'], name='Category'),
+        columns=pd.Index(views['quadrants'], name='Quadrant'),
+    )
+    postings = scenario_search.PackedPostings(
+        arrays['search_terms'], arrays['search_offsets'], arrays['search_docs'], arrays['search_tfs']
+    )
+    return {
+        'version': version,
+        'df': df,
+        'quadrant_codes': codes,
+        'quadrant_index': {
+            key: rows[offsets[i]:offsets[i + 1]] for i, key in enumerate(scenario_data.QUADRANT_NAMES)
+        },
+        'category_counts': counts,
+        'search_index': scenario_search.SearchIndex(postings, arrays['search_doc_lengths']),
+        'field_index': scenario_fields.FieldIndex(views['fields'], arrays['field_bits'], arrays['field_required']),
+        'priority_index': scenario_scoring.PriorityIndex(arrays['priority_combo_ids']),
+        'similarity_index': scenario_similarity.SimilarityIndex(arrays['similarity_signatures']),
+    }
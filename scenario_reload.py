@@ -0,0 +1,214 @@
+"""Background reloading of the catalog when its CSV is edited.
+
+A single CatalogWatcher per process polls the CSV, applies edits
+incrementally through `scenario_data.update_dataset` and swaps the new
+dataset in with one reference assignment, so every session sees either the
+old or the new version, never a half-built one. The process-wide
+CatalogRegistry returned by `shared_registry` is what the dashboard sessions
+and the JSON API read from. With FRAUD_DASHBOARD_DATA_PLANE=1 the watchers
+attach to versions published through `scenario_plane` instead, so several
+processes share one copy of every catalog.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import scenario_data
+import scenario_plane
+import scenario_store
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the CSV for edits (0 disables the background watcher)
+RELOAD_INTERVAL = float(os.environ.get('FRAUD_DASHBOARD_RELOAD_INTERVAL', 2))
+
+# Directory scanned for catalog CSVs, the catalog shown by default and how many stay loaded
+CATALOG_DIR = os.environ.get('FRAUD_DASHBOARD_CATALOG_DIR', '.')
+DEFAULT_CATALOG = os.environ.get('FRAUD_DASHBOARD_DEFAULT_CATALOG', scenario_store.DEFAULT_CSV)
+MAX_LOADED_CATALOGS = int(os.environ.get('FRAUD_DASHBOARD_MAX_CATALOGS', 8))
+
+# Attach to the shared data plane instead of building each catalog in this process
+DATA_PLANE = os.environ.get('FRAUD_DASHBOARD_DATA_PLANE', '').lower() in ('1', 'true', 'yes')
+
+# Process-wide registries by absolute catalog directory
+_shared_registries = {}
+_shared_lock = threading.Lock()
+
+
+class CatalogWatcher:
+    """Holds the current dataset of one CSV catalog and keeps it up to date"""
+
+    def __init__(self, csv_path=scenario_store.DEFAULT_CSV, interval=2.0, shared=False):
+        self.csv_path = csv_path
+        self.interval = interval
+        self.shared = shared
+        self.current = None
+        # Data plane publication counter of the current dataset (shared mode only)
+        self.counter = None
+        # Modification time (epoch seconds) of the CSV the current dataset was loaded from
+        self.modified = None
+        # Last error raised while reloading in the background, if any
+        self.error = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        # (mtime, size) of a CSV edit that failed to load, so it is not retried every poll
+        self._failed_stat = None
+        # (mtime, size) of the CSV as of the watcher's last successful refresh
+        self._seen_stat = None
+
+    def refresh(self):
+        """Re-ingest the CSV if it changed and return the current dataset"""
+        with self._lock:
+            modified = os.stat(self.csv_path).st_mtime
+            if self.shared:
+                return self._attach(modified)
+            version = scenario_store.ensure_store(self.csv_path)
+            current = self.current
+            if current is not None and current['version'] == version:
+                return current
+
+            df = scenario_store.open_store(self.csv_path)
+            if current is None:
+                data = scenario_data.build_dataset(df, version)
+            else:
+                data = scenario_data.update_dataset(current, df, version)
+                logger.info("Reloaded %s (%s -> %s)", self.csv_path, current['version'][:8], version[:8])
+
+            self.current = data
+            self.modified = modified
+            self.error = None
+            return data
+
+    def _attach(self, modified):
+        # Publishes the CSV's version unless another process already did
+        counter, version = scenario_plane.publish(self.csv_path, self.current)
+        current = self.current
+        if current is None or current['version'] != version:
+            self.current = scenario_plane.attach(self.csv_path, version)
+            self.modified = modified
+            if current is not None:
+                logger.info("Attached %s version %s (#%d)", self.csv_path, version[:8], counter)
+        self.counter = counter
+        self.error = None
+        return self.current
+
+    def get(self):
+        """Return the current dataset, loading it synchronously on first use"""
+        if self.current is None or self._thread is None:
+            return self.refresh()
+        return self.current
+
+    def start(self):
+        """Start polling the CSV in a daemon thread (no-op if interval <= 0)"""
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='catalog-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling; the current dataset is released once nothing references the watcher"""
+        self._stopped.set()
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                stat = os.stat(self.csv_path)
+            except OSError as e:
+                self.error = e
+                continue
+            fingerprint = (stat.st_mtime_ns, stat.st_size)
+            if fingerprint == self._failed_stat:
+                continue
+            if self.shared and fingerprint == self._seen_stat and scenario_plane.read_counter(self.csv_path)[0] == self.counter:
+                # Neither the CSV nor the published version moved
+                continue
+
+            try:
+                self.refresh()
+                self._failed_stat = None
+                self._seen_stat = fingerprint
+            except Exception as e:
+                # Keep serving the last good version; the UI reports the error
+                self.error = e
+                self._failed_stat = fingerprint
+                logger.warning("Reloading %s failed: %s", self.csv_path, e)
+
+
+class CatalogRegistry:
+    """Lazily started CatalogWatchers for every CSV catalog in a directory.
+
+    A catalog is only parsed when first requested; once more than
+    `max_loaded` catalogs are warm, the least recently used one is stopped
+    and dropped so a single process can serve many catalogs in bounded RAM.
+    """
+
+    def __init__(self, directory='.', max_loaded=8, interval=2.0, shared=False):
+        self.directory = os.path.abspath(directory)
+        self.max_loaded = max_loaded
+        self.interval = interval
+        self.shared = shared
+        self._watchers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def catalogs(self):
+        """File names of the CSV catalogs currently in the directory"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name.lower().endswith('.csv'))
+
+    def loaded(self):
+        """Names of the catalogs currently held in memory, coldest first"""
+        with self._lock:
+            return list(self._watchers)
+
+    def get(self, name):
+        """Watcher for catalog `name`, created on first use"""
+        # Only plain file names from the catalog directory are accepted
+        if os.path.basename(name) != name or not name.lower().endswith('.csv'):
+            raise FileNotFoundError(name)
+
+        with self._lock:
+            watcher = self._watchers.get(name)
+            if watcher is not None:
+                self._watchers.move_to_end(name)
+                return watcher
+
+            watcher = CatalogWatcher(os.path.join(self.directory, name), self.interval, self.shared).start()
+            self._watchers[name] = watcher
+            while len(self._watchers) > self.max_loaded:
+                cold_name, cold = self._watchers.popitem(last=False)
+                cold.stop()
+                logger.info("Evicted catalog %s", cold_name)
+            return watcher
+
+    def close(self):
+        """Stop every watcher and forget all loaded catalogs"""
+        with self._lock:
+            watchers = list(self._watchers.values())
+            self._watchers.clear()
+        for watcher in watchers:
+            watcher.stop()
+
+
+def shared_registry():
+    """The process-wide CatalogRegistry for CATALOG_DIR, shared by every session and the API"""
+    directory = os.path.abspath(CATALOG_DIR)
+    with _shared_lock:
+        registry = _shared_registries.get(directory)
+        if registry is None:
+            registry = CatalogRegistry(directory, MAX_LOADED_CATALOGS, RELOAD_INTERVAL, DATA_PLANE)
+            _shared_registries[directory] = registry
+        return registry
+
+
+def reset_shared_registries():
+    """Close and drop every shared registry so the next lookup starts cold"""
+    with _shared_lock:
+        registries = list(_shared_registries.values())
+        _shared_registries.clear()
+    for registry in registries:
+        registry.close()
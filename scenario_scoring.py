@@ -0,0 +1,91 @@
+"""Weighted priority scores over the four ordinal ratings.
+
+Each scenario's score depends only on its combination of Effort, Complexity,
+Feasibility and Business Value levels, so rows are pre-sorted into one bucket
+per combination at load time. Ranking with new weights then only scores and
+sorts the (at most 4^4) buckets, independent of catalog size.
+"""
+import numpy as np
+import pandas as pd
+
+import scenario_store
+
+# Criteria where a higher rating makes a scenario more attractive
+GAIN_CRITERIA = ['Business Value', 'Feasibility']
+# Criteria where a higher rating makes a scenario less attractive
+COST_CRITERIA = ['Effort', 'Complexity']
+CRITERIA = GAIN_CRITERIA + COST_CRITERIA
+
+DEFAULT_WEIGHTS = {
+    'Business Value': 0.4,
+    'Feasibility': 0.3,
+    'Effort': 0.15,
+    'Complexity': 0.15,
+}
+
+# Levels per criterion: Low/Medium/High plus one slot for a missing rating
+_N_LEVELS = len(scenario_store.RATING_CATEGORIES) + 1
+_MAX_LEVEL = len(scenario_store.RATING_CATEGORIES) - 1
+
+
+def _benefit_levels(df):
+    """(n_rows, 4) benefit of each criterion, 0 (worst) .. 2 (best); -1 when unrated"""
+    levels = np.empty((len(df), len(CRITERIA)), dtype=np.int8)
+    for i, column in enumerate(CRITERIA):
+        codes = pd.Categorical(df[column], categories=scenario_store.RATING_CATEGORIES).codes
+        benefit = codes if column in GAIN_CRITERIA else _MAX_LEVEL - codes
+        levels[:, i] = np.where(codes >= 0, benefit, -1)
+    return levels
+
+
+class PriorityIndex:
+    """Rows bucketed by rating combination for weight-independent top-K queries"""
+
+    def __init__(self, combo_ids):
+        self.combo_ids = combo_ids
+        n_combos = _N_LEVELS ** len(CRITERIA)
+        # Rows sorted by combination; bucket c is rows[offsets[c]:offsets[c + 1]]
+        self.rows = np.argsort(combo_ids, kind='stable')
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(combo_ids, minlength=n_combos))])
+
+        # Benefit level of every criterion for every possible combination
+        digits = np.arange(n_combos)[:, None] // (_N_LEVELS ** np.arange(len(CRITERIA))) % _N_LEVELS
+        self.combo_levels = digits - 1
+        self.present = np.flatnonzero(np.diff(self.offsets))
+
+    def __len__(self):
+        return len(self.combo_ids)
+
+    def combo_scores(self, weights=None):
+        """Score (0-100) of every rating combination; unrated criteria score 0"""
+        weights = weights or DEFAULT_WEIGHTS
+        w = np.array([max(float(weights.get(c, 0)), 0.0) for c in CRITERIA])
+        total = w.sum()
+        if total == 0:
+            return np.zeros(len(self.combo_levels))
+        benefit = np.clip(self.combo_levels, 0, None) / _MAX_LEVEL
+        return benefit @ w / total * 100
+
+    def top_k(self, k, weights=None):
+        """Row positions and scores of the `k` best scenarios, best first"""
+        combo_scores = self.combo_scores(weights)
+        # Stable sort keeps the bucket order (and row order inside buckets) deterministic
+        order = self.present[np.argsort(-combo_scores[self.present], kind='stable')]
+
+        picked, remaining = [], k
+        for combo in order:
+            if remaining <= 0:
+                break
+            bucket = self.rows[self.offsets[combo]:self.offsets[combo + 1]][:remaining]
+            picked.append(bucket)
+            remaining -= len(bucket)
+
+        rows = np.concatenate(picked) if picked else np.empty(0, dtype=np.intp)
+        return rows, combo_scores[self.combo_ids[rows]]
+
+
+def build_priority_index(df):
+    """Encode the four ratings of every row into a PriorityIndex"""
+    levels = _benefit_levels(df).astype(np.int64) + 1
+    combo_ids = (levels * (_N_LEVELS ** np.arange(len(CRITERIA)))).sum(axis=1)
+    return PriorityIndex(combo_ids)
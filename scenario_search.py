@@ -0,0 +1,197 @@
+"""Inverted full-text index over the scenario narrative columns.
+
+Built once per data version; queries are tokenized the same way as the
+documents, every query token matches as a prefix, and hits are ranked with
+BM25.
+"""
+import bisect
+import re
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = [
+    'Scenario',
+    'Objective',
+    'Mechanic',
+    'Important aspects/ loopholes',
+    'Detection Rule & Signal',
+    'Must Have Data',
+]
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Standard BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Upper bound on vocabulary terms a single prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+
+
+def tokenize(text):
+    """Lower-case alphanumeric tokens of a string"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class PackedPostings(Mapping):
+    """Read-only term -> (row positions, term frequencies) mapping over four flat arrays.
+
+    `terms` is sorted and term i owns `docs[offsets[i]:offsets[i + 1]]` (and
+    the same slice of `tfs`), so the arrays can be memory-mapped from disk and
+    shared by every process instead of living in a per-process dict.
+    """
+
+    def __init__(self, terms, offsets, docs, tfs):
+        self.terms = terms
+        self.offsets = offsets
+        self.docs = docs
+        self.tfs = tfs
+
+    def __getitem__(self, term):
+        i = int(np.searchsorted(self.terms, term))
+        if i == len(self.terms) or self.terms[i] != term:
+            raise KeyError(term)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.docs[start:end], self.tfs[start:end]
+
+    def __iter__(self):
+        return (str(term) for term in self.terms)
+
+    def items(self):
+        # Walks the offsets in order instead of looking every term up again
+        offsets = self.offsets.tolist()
+        for i, term in enumerate(self.terms.tolist()):
+            yield term, (self.docs[offsets[i]:offsets[i + 1]], self.tfs[offsets[i]:offsets[i + 1]])
+
+    def __len__(self):
+        return len(self.terms)
+
+
+def pack_postings(postings):
+    """(terms, offsets, docs, tfs) arrays holding a term -> postings mapping"""
+    terms = sorted(postings)
+    lengths = [len(postings[term][0]) for term in terms]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    if not terms:
+        return np.array([], dtype=str), offsets, np.empty(0, dtype=np.intp), np.empty(0)
+    docs = np.concatenate([postings[term][0] for term in terms]).astype(np.intp)
+    tfs = np.concatenate([postings[term][1] for term in terms]).astype(float)
+    return np.array(terms, dtype=str), offsets, docs, tfs
+
+
+class SearchIndex:
+    """BM25-ranked inverted index mapping terms to (row positions, term frequencies)"""
+
+    def __init__(self, postings, doc_lengths):
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        # Packed postings are already sorted; bisect works on the array directly
+        self.vocabulary = postings.terms if isinstance(postings, PackedPostings) else sorted(postings)
+        self.avg_doc_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def expand(self, token):
+        """Vocabulary terms starting with `token`, exact match first"""
+        start = bisect.bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query, limit=50):
+        """Return (row positions, scores) of the best matches for `query`, best first"""
+        tokens = tokenize(query)
+        if not tokens or len(self) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        n_docs = len(self)
+        scores = np.zeros(n_docs)
+        # Length normalisation is shared by every term
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths / self.avg_doc_length)
+
+        for token in dict.fromkeys(tokens):
+            for term in self.expand(token):
+                docs, tfs = self.postings[term]
+                idf = np.log1p((n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                scores[docs] += idf * tfs * (BM25_K1 + 1) / (tfs + norm[docs])
+
+        hits = np.flatnonzero(scores)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(scores[hits], -limit)[-limit:]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        return hits, scores[hits]
+
+    def apply_changes(self, position_map, df, changed_rows, columns=SEARCH_COLUMNS):
+        """Return an index for a new version of the catalog without re-tokenizing it all.
+
+        `position_map[old_position]` is the row's position in `df`, or -1 if
+        the row was removed or changed; only `changed_rows` of `df` are
+        tokenized again.
+        """
+        delta = build_search_index(df.iloc[changed_rows], columns)
+        changed_rows = np.asarray(changed_rows, dtype=np.intp)
+
+        doc_lengths = np.zeros(len(df))
+        kept = position_map >= 0
+        doc_lengths[position_map[kept]] = self.doc_lengths[kept]
+        doc_lengths[changed_rows] = delta.doc_lengths
+
+        postings = {}
+        for term, (docs, tfs) in self.postings.items():
+            mapped = position_map[docs]
+            keep = mapped >= 0
+            if keep.any():
+                postings[term] = (mapped[keep], tfs[keep])
+
+        for term, (docs, tfs) in delta.postings.items():
+            docs = changed_rows[docs]
+            if term in postings:
+                docs = np.concatenate([postings[term][0], docs])
+                tfs = np.concatenate([postings[term][1], tfs])
+            postings[term] = (docs, tfs)
+
+        # Keep postings sorted by row position, as a full build would
+        for term, (docs, tfs) in postings.items():
+            if len(docs) > 1 and (np.diff(docs) < 0).any():
+                order = np.argsort(docs, kind='stable')
+                postings[term] = (docs[order], tfs[order])
+
+        return SearchIndex(postings, doc_lengths)
+
+
+def build_search_index(df, columns=SEARCH_COLUMNS):
+    """Tokenize the narrative columns of every row and build a SearchIndex"""
+    text = pd.Series([''] * len(df), dtype=object)
+    for column in columns:
+        if column in df.columns:
+            text = text + ' ' + df[column].fillna('').astype(str).to_numpy(dtype=object)
+
+    tokens = text.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    n_docs = len(df)
+    doc_ids = tokens.index.to_numpy(dtype=np.int64)
+    doc_lengths = np.bincount(doc_ids, minlength=n_docs).astype(float)
+
+    # Encode (term, row) pairs as single integers; np.unique then yields
+    # term frequencies grouped by term and sorted by row in one pass
+    term_codes, terms = pd.factorize(tokens.to_numpy())
+    pair_keys, tfs = np.unique(term_codes.astype(np.int64) * max(n_docs, 1) + doc_ids, return_counts=True)
+    term_of_pair = pair_keys // max(n_docs, 1)
+    docs = (pair_keys % max(n_docs, 1)).astype(np.intp)
+    tfs = tfs.astype(float)
+
+    boundaries = np.flatnonzero(np.diff(term_of_pair)) + 1
+    starts = np.concatenate([[0], boundaries]).astype(int)
+    ends = np.concatenate([boundaries, [len(pair_keys)]]).astype(int)
+
+    postings = {
+        terms[term_of_pair[start]]: (docs[start:end], tfs[start:end])
+        for start, end in zip(starts, ends)
+        if end > start
+    }
+    return SearchIndex(postings, doc_lengths)
@@ -0,0 +1,201 @@
+"""MinHash/LSH index of near-duplicate and overlapping scenarios.
+
+Each scenario is reduced to a set of shingles: the words of its Mechanic and
+Detection Rule & Signal text (stop words dropped) plus its parsed Data
+Fields. A MinHash signature summarises the set; the share of positions two
+signatures agree on estimates the Jaccard similarity of their sets.
+
+Finding every near-duplicate pair uses locality-sensitive hashing: the
+signature is cut into bands and only scenarios that share a band bucket are
+compared, so the work grows with the number of similar pairs instead of the
+square of the catalog size. Looking up the scenarios similar to one scenario
+is a single vectorised pass over the signatures.
+"""
+import numpy as np
+import pandas as pd
+
+import scenario_fields
+from scenario_search import TOKEN_PATTERN
+
+SIMILARITY_COLUMNS = ['Mechanic', 'Detection Rule & Signal']
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in into is it its of on or that the their them '
+    'they this to via was were when which who with'.split()
+)
+
+# 16 bands of 4 rows: a pair shares a bucket with probability 1 - (1 - J**4)**16,
+# about 64% at J = 0.5, 89% at 0.6 and 99% at 0.7, while pairs below 0.2 rarely do
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Fixed seed so every process (and every rebuild) hashes shingles the same way
+SEED = 20240611
+_rng = np.random.default_rng(SEED)
+_PERM_A = _rng.integers(0, 2**64, NUM_PERMUTATIONS, dtype=np.uint64, endpoint=False) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**64, NUM_PERMUTATIONS, dtype=np.uint64, endpoint=False)
+
+# Signature value of a scenario without any shingles; such rows match nothing
+EMPTY = np.uint32(0xFFFFFFFF)
+
+# Shingle slots gathered per chunk while building signatures, bounding temporary memory
+CHUNK_SHINGLES = 2_000_000
+
+# Buckets larger than this are paired against their first member only
+MAX_BUCKET = 200
+
+# Candidate pairs whose signatures are compared at once
+VERIFY_CHUNK = 100_000
+
+
+def _shingles(df, columns, fields_column):
+    """(row positions, vocabulary codes, 32-bit vocabulary hashes) of every shingle, sorted by row"""
+    text = pd.Series([''] * len(df), dtype=object)
+    for column in columns:
+        if column in df.columns:
+            text = text + ' ' + df[column].fillna('').astype(str).to_numpy(dtype=object)
+    words = text.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    words = words[~words.isin(STOP_WORDS)]
+
+    shingles = [words]
+    if fields_column in df.columns:
+        fields = df[fields_column].reset_index(drop=True).map(scenario_fields.parse_fields).explode().dropna()
+        # Prefixed so a field name never collides with the same word in the text
+        shingles.append('field:' + fields)
+    shingles = pd.concat(shingles)
+
+    rows = shingles.index.to_numpy(dtype=np.intp)
+    order = np.argsort(rows, kind='stable')
+    # Each distinct shingle is hashed once; the vocabulary is far smaller than the corpus
+    codes, vocabulary = pd.factorize(shingles.to_numpy(dtype=object)[order])
+    hashes = pd.util.hash_array(np.asarray(vocabulary, dtype=object)) & np.uint64(0xFFFFFFFF)
+    return rows[order], codes, hashes
+
+
+def minhash_signatures(df, columns=SIMILARITY_COLUMNS, fields_column=scenario_fields.FIELDS_COLUMN):
+    """(len(df), NUM_PERMUTATIONS) uint32 MinHash signatures of every row's shingles"""
+    rows, codes, hashes = _shingles(df, columns, fields_column)
+
+    # Multiply-add-shift hashing with 64-bit coefficients (products wrap mod 2**64): the
+    # high 32 bits give one permutation per signature position, applied to the vocabulary
+    # once. The extra last entry pads short rows and is never smaller than a real value.
+    permuted = ((hashes[:, None] * _PERM_A + _PERM_B) >> np.uint64(32)).astype(np.uint32)
+    permuted = np.vstack([permuted, np.full((1, NUM_PERMUTATIONS), EMPTY, dtype=np.uint32)])
+
+    # Shingle codes laid out as a padded (rows, longest row) matrix, so every
+    # signature is a contiguous minimum over one axis
+    counts = np.bincount(rows, minlength=len(df))
+    row_starts = np.concatenate([[0], np.cumsum(counts)])
+    slots = np.arange(len(rows)) - row_starts[rows]
+
+    signatures = np.full((len(df), NUM_PERMUTATIONS), EMPTY, dtype=np.uint32)
+    start = 0
+    while start < len(df):
+        # Chunks end where their padded matrix would outgrow CHUNK_SHINGLES slots
+        widths = np.maximum.accumulate(counts[start:start + CHUNK_SHINGLES])
+        fits = widths * np.arange(1, len(widths) + 1) <= CHUNK_SHINGLES
+        # (the padded size only grows with the row count, so `fits` is a prefix of Trues)
+        stop = start + max(1, int(fits.sum()))
+        width = widths[stop - start - 1]
+        if width:
+            padded = np.full((stop - start, width), len(hashes), dtype=np.intp)
+            chunk = slice(row_starts[start], row_starts[stop])
+            padded[rows[chunk] - start, slots[chunk]] = codes[chunk]
+            signatures[start:stop] = permuted[padded].min(axis=1)
+        start = stop
+    return signatures
+
+
+class SimilarityIndex:
+    """MinHash signatures of every scenario with LSH-based near-duplicate search"""
+
+    def __init__(self, signatures):
+        self.signatures = signatures
+        self._band_keys = None
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def similar(self, position, limit=5, min_similarity=0.1):
+        """Row positions and estimated similarities of the scenarios closest to `position`, best first"""
+        signature = self.signatures[position]
+        if len(self) < 2 or (signature == EMPTY).all():
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        scores = (self.signatures == signature).mean(axis=1)
+        scores[position] = 0
+        hits = np.flatnonzero(scores >= min_similarity)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        return hits, scores[hits]
+
+    def band_keys(self):
+        """(BANDS, n) uint64 bucket key of every row in every band; rows without shingles get none"""
+        if self._band_keys is None:
+            bands = self.signatures.astype(np.uint64).reshape(len(self), BANDS, ROWS_PER_BAND)
+            keys = bands[:, :, 0].copy()
+            for i in range(1, ROWS_PER_BAND):
+                # FNV-style mixing; colliding buckets are weeded out by the signature check
+                keys = (keys * np.uint64(0x100000001B3)) ^ bands[:, :, i]
+            self._band_keys = keys.T
+        return self._band_keys
+
+    def candidate_pairs(self):
+        """Distinct (i, j) row pairs, i < j, sharing at least one band bucket"""
+        n = len(self)
+        searchable = np.flatnonzero((self.signatures != EMPTY).any(axis=1))
+        found = []
+        for keys in self.band_keys():
+            order = searchable[np.argsort(keys[searchable], kind='stable')]
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            sizes = np.diff(np.r_[starts, len(order)])
+            bucket_end = np.repeat(starts + sizes, sizes)
+
+            # Oversized buckets (a shared boilerplate band) pair with their first member only
+            for start, size in zip(starts[sizes > MAX_BUCKET], sizes[sizes > MAX_BUCKET]):
+                found.append(np.column_stack([np.full(size - 1, order[start]), order[start + 1:start + size]]))
+
+            # Every pair of a bucket is (k, k + offset) in sorted order for some offset
+            members = np.flatnonzero(np.repeat((sizes > 1) & (sizes <= MAX_BUCKET), sizes))
+            offset = 1
+            while len(members):
+                members = members[members + offset < bucket_end[members]]
+                found.append(np.column_stack([order[members], order[members + offset]]))
+                offset += 1
+        if not found:
+            return np.empty((0, 2), dtype=np.intp)
+        pairs = np.sort(np.concatenate(found), axis=1).astype(np.int64)
+        codes = np.unique(pairs[:, 0] * n + pairs[:, 1])
+        return np.column_stack([codes // n, codes % n]).astype(np.intp)
+
+    def near_duplicates(self, threshold=0.6):
+        """(pairs, similarities) of every row pair estimated at least `threshold` similar, best first"""
+        pairs = self.candidate_pairs()
+        scores = np.empty(len(pairs))
+        for start in range(0, len(pairs), VERIFY_CHUNK):
+            chunk = pairs[start:start + VERIFY_CHUNK]
+            scores[start:start + VERIFY_CHUNK] = (self.signatures[chunk[:, 0]] == self.signatures[chunk[:, 1]]).mean(axis=1)
+        keep = np.flatnonzero(scores >= threshold)
+        keep = keep[np.argsort(-scores[keep], kind='stable')]
+        return pairs[keep], scores[keep]
+
+    def apply_changes(self, position_map, df, changed_rows):
+        """Return an index for a new version of the catalog, hashing only `changed_rows` again.
+
+        `position_map[old_position]` is the row's position in `df`, or -1 if
+        the row was removed or changed.
+        """
+        changed_rows = np.asarray(changed_rows, dtype=np.intp)
+        signatures = np.full((len(df), NUM_PERMUTATIONS), EMPTY, dtype=np.uint32)
+        kept = position_map >= 0
+        signatures[position_map[kept]] = self.signatures[kept]
+        signatures[changed_rows] = minhash_signatures(df.iloc[changed_rows])
+        return SimilarityIndex(signatures)
+
+
+def build_similarity_index(df):
+    """Compute the MinHash signatures of every row and wrap them in a SimilarityIndex"""
+    return SimilarityIndex(minhash_signatures(df))
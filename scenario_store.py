@@ -0,0 +1,224 @@
+"""Columnar on-disk store for the fraud framework catalog.
+
+The CSV is only an import format: it is converted once into an uncompressed
+Arrow IPC (Feather v2) file which is then memory-mapped, so every session and
+worker process reads the same OS pages instead of holding its own parsed copy.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+DEFAULT_CSV = 'fraud_framework.csv'
+STORE_DIR = '.scenario_store'
+# Bump whenever the stored layout or schema changes so old stores get rebuilt
+STORE_FORMAT = 3
+
+# Ordinal rating columns and their levels, lowest first
+RATING_COLUMNS = ['Effort', 'Complexity', 'Feasibility', 'Business Value']
+RATING_CATEGORIES = ['Low', 'Medium', 'High']
+RATING_DTYPE = pd.CategoricalDtype(RATING_CATEGORIES, ordered=True)
+
+# Columns identifying a scenario across edits of the CSV
+KEY_COLUMNS = ['Category', 'Scenario']
+
+# Category of scenarios whose Category cell is empty
+UNCATEGORIZED = 'Uncategorized'
+
+
+def store_paths(csv_path):
+    """Return the (arrow file, metadata file) paths used for a CSV catalog"""
+    csv_dir, csv_name = os.path.split(os.path.abspath(csv_path))
+    base = os.path.join(csv_dir, STORE_DIR, os.path.splitext(csv_name)[0])
+    return base + '.arrow', base + '.json'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _strip_text(values):
+    """Cell values as stripped strings, missing values left as NaN"""
+    missing = values.isna()
+    return values.astype(str).str.strip().where(~missing)
+
+
+def apply_schema(df):
+    """Cast rating columns to ordered categoricals and Category to a category dtype.
+
+    Empty Category cells become UNCATEGORIZED. Raises ValueError if a required column is missing or a rating column holds
+    a value outside Low/Medium/High.
+    """
+    missing = [column for column in KEY_COLUMNS + RATING_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Catalog is missing required column(s) {missing}")
+
+    for column in RATING_COLUMNS:
+        values = _strip_text(df[column])
+        present = values.dropna()
+        unknown = present[~present.isin(RATING_CATEGORIES)].unique()
+        if len(unknown) > 0:
+            raise ValueError(
+                f"Unknown {column} level(s) {sorted(unknown)}; "
+                f"expected one of {RATING_CATEGORIES}"
+            )
+        df[column] = values.astype(RATING_DTYPE)
+
+    categories = _strip_text(df['Category'])
+    df['Category'] = categories.where(categories != '').fillna(UNCATEGORIZED).astype('category')
+    return df
+
+
+def read_catalog_csv(csv_path):
+    """Parse a catalog CSV into a DataFrame with cleaned column names and schema"""
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.strip()
+    return apply_schema(df)
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    """Write to a temporary sibling and rename it over `path`"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as handle:
+            json.dump(meta, handle)
+    _write_atomic(meta_path, write)
+
+
+def convert_csv(csv_path, stat=None, digest=None):
+    """Convert a CSV catalog into its Arrow store and return the store metadata"""
+    arrow_path, meta_path = store_paths(csv_path)
+    os.makedirs(os.path.dirname(arrow_path), exist_ok=True)
+    stat = stat or os.stat(csv_path)
+    digest = digest or file_digest(csv_path)
+
+    table = pa.Table.from_pandas(read_catalog_csv(csv_path), preserve_index=False)
+    # Uncompressed so the file can be memory-mapped without decoding
+    _write_atomic(arrow_path, lambda tmp: feather.write_feather(table, tmp, compression='uncompressed'))
+
+    meta = {
+        'format': STORE_FORMAT,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+        'source_sha256': digest,
+        'rows': table.num_rows,
+    }
+    _write_meta(meta_path, meta)
+    return meta
+
+
+def ensure_store(csv_path=DEFAULT_CSV):
+    """Make sure the Arrow store matches the CSV and return its data version.
+
+    A stat() is enough on the common path; the CSV is only hashed when its
+    mtime or size moved, and only re-converted when the content changed.
+    """
+    arrow_path, meta_path = store_paths(csv_path)
+    stat = os.stat(csv_path)
+    meta = _read_meta(meta_path)
+
+    if meta is None or meta.get('format') != STORE_FORMAT or not os.path.exists(arrow_path):
+        meta = convert_csv(csv_path, stat=stat)
+    elif (meta['source_mtime_ns'], meta['source_size']) != (stat.st_mtime_ns, stat.st_size):
+        digest = file_digest(csv_path)
+        if digest != meta['source_sha256']:
+            meta = convert_csv(csv_path, stat=stat, digest=digest)
+        else:
+            # Touched but unchanged: refresh the stat fingerprint only
+            meta.update(source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size)
+            _write_meta(meta_path, meta)
+
+    return data_version(meta)
+
+
+def data_version(meta):
+    """Version of a catalog's data: its CSV content hash, salted with the store format.
+
+    Derived views cached by version (the data plane, snapshots, exports) are
+    then rebuilt whenever a new format reads the same CSV differently.
+    """
+    return hashlib.sha256(f"{meta['format']}:{meta['source_sha256']}".encode()).hexdigest()
+
+
+def open_store(csv_path=DEFAULT_CSV, columns=None):
+    """Memory-map the Arrow store of a catalog (optionally only `columns`) as a DataFrame"""
+    arrow_path, _ = store_paths(csv_path)
+    return read_arrow(arrow_path, columns)
+
+
+def read_arrow(arrow_path, columns=None):
+    """Memory-map an uncompressed Arrow file as a DataFrame"""
+    table = feather.read_table(arrow_path, columns=columns, memory_map=True)
+    # Arrow-backed columns keep pointing at the mapped pages instead of
+    # being copied into Python objects; dictionary columns come back as
+    # (ordered) pandas categoricals
+    return table.to_pandas(types_mapper=_arrow_types_mapper)
+
+
+def _arrow_types_mapper(arrow_type):
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def _row_keys(df, key_columns):
+    """Stable per-row key: hash of the key columns plus the occurrence number of duplicates"""
+    key_hash = pd.util.hash_pandas_object(df[key_columns].astype(str), index=False).to_numpy()
+    occurrence = pd.Series(key_hash).groupby(key_hash).cumcount().to_numpy()
+    return pd.MultiIndex.from_arrays([key_hash, occurrence])
+
+
+def diff_catalog(old_df, new_df, key_columns=KEY_COLUMNS):
+    """Match rows of two catalog versions by (Category, Scenario).
+
+    Returns `(position_map, changed_rows)`: `position_map[i]` is the position
+    in `new_df` of unchanged old row i (-1 if it was edited or removed) and
+    `changed_rows` holds the positions in `new_df` of added or edited rows.
+    """
+    common = [c for c in old_df.columns if c in new_df.columns]
+    if common != list(new_df.columns):
+        # Columns were added, removed or reordered: treat every row as changed
+        return np.full(len(old_df), -1, dtype=np.intp), np.arange(len(new_df), dtype=np.intp)
+
+    old_content = pd.util.hash_pandas_object(old_df[common].astype(str), index=False).to_numpy()
+    new_content = pd.util.hash_pandas_object(new_df[common].astype(str), index=False).to_numpy()
+
+    new_positions = pd.Series(np.arange(len(new_df)), index=_row_keys(new_df, key_columns))
+    matched = new_positions.reindex(_row_keys(old_df, key_columns)).to_numpy()
+
+    position_map = np.full(len(old_df), -1, dtype=np.intp)
+    found = ~np.isnan(matched)
+    old_found = np.flatnonzero(found)
+    new_found = matched[found].astype(np.intp)
+    same = old_content[old_found] == new_content[new_found]
+    position_map[old_found[same]] = new_found[same]
+
+    unchanged = np.zeros(len(new_df), dtype=bool)
+    unchanged[new_found[same]] = True
+    return position_map, np.flatnonzero(~unchanged)
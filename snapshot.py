@@ -0,0 +1,319 @@
+"""Build a static, pre-rendered snapshot of the matrix overview.
+
+Usage:
+    python snapshot.py                          # build ./snapshot from fraud_framework.csv
+    python snapshot.py --csv emea.csv --output /srv/fraud-snapshot
+    python snapshot.py --watch                  # rebuild whenever the CSV changes
+    python -m http.server --directory snapshot  # serve it read-only
+
+The snapshot holds the nine quadrant tiles, the category heatmap, the summary
+statistics and one paginated page of scenario cards per quadrant, rendered
+with the dashboard's own HTML and CSS. It is only rebuilt when the catalog
+version changes. `output` is a symlink to the current build, kept in the
+sibling directory `<output>.builds`: every build is written to a directory of
+its own and published by atomically replacing the link, so a file server
+(resolving the path per request) always sees one complete snapshot and never
+a half-written or missing one. Superseded builds are removed afterwards.
+"""
+import argparse
+import glob
+import html
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import time
+
+import plotly.offline
+
+import dashboard_style
+import dashboard_views
+import scenario_data
+import scenario_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = 'snapshot'
+MANIFEST = 'manifest.json'
+
+# Scenario cards per static quadrant page
+CARDS_PER_PAGE = 100
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+{css}
+<style>
+body {{ font-family: "Source Sans Pro", sans-serif; max-width: 1300px; margin: 0 auto; padding: 1rem 2rem; }}
+a.matrix-button {{ color: inherit; text-decoration: none; }}
+.matrix-grid {{ display: grid; grid-template-columns: 0.25fr 1fr 1fr 1fr; gap: 0.5rem; align-items: stretch; }}
+.axis-cell {{ text-align: center; font-weight: bold; color: #1f77b4; background-color: #f8f9fa; border-radius: 8px; padding: 1rem; }}
+.metrics {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; }}
+.pager {{ display: flex; justify-content: space-between; margin: 1rem 0; }}
+footer {{ color: #888; font-size: 0.85rem; margin-top: 2rem; }}
+</style>
+{head}
+</head>
+<body>
+{body}
+<footer>Snapshot of catalog version {version} built {built}.</footer>
+</body>
+</html>
+"""
+
+
+def quadrant_page_name(key, page=1):
+    return f"quadrant-{key}.html" if page == 1 else f"quadrant-{key}-{page}.html"
+
+
+def render_page(title, body, version, built, head=''):
+    return PAGE_TEMPLATE.format(
+        title=html.escape(title), css=dashboard_style.DASHBOARD_CSS, head=head,
+        body=body, version=version[:12], built=built
+    )
+
+
+def render_matrix(data):
+    """The 3x3 quadrant grid, each tile linking to its quadrant page"""
+    cells = ['<div></div>'] + [
+        f'<div class="axis-cell">{level.upper()}</div>' for level in scenario_data.RATING_LEVELS
+    ]
+    for bv in scenario_data.RATING_LEVELS:
+        cells.append(f'<div class="axis-cell">{bv.upper()}</div>')
+        for feas in scenario_data.RATING_LEVELS:
+            key = f"{bv}-{feas}"
+            info = dashboard_views.get_quadrant_info(bv, feas)
+            count = len(data['quadrant_index'][key])
+            cells.append(
+                f'<a class="matrix-button {info["class"]}" href="{quadrant_page_name(key)}">'
+                f'<div class="quadrant-title">{info["icon"]} {html.escape(info["title"])}</div>'
+                f'<div class="count-highlight">{count}</div>scenarios<br>'
+                f'<small>{html.escape(info["description"])}</small></a>'
+            )
+    return (
+        '<p class="axis-label" style="text-align: center;">FEASIBILITY &rarr;</p>'
+        '<p class="axis-label">BUSINESS VALUE &darr;</p>'
+        f'<div class="matrix-grid">{"".join(cells)}</div>'
+    )
+
+
+def render_summary(data):
+    """Summary statistics, as on the dashboard overview"""
+    df = data['df']
+    metrics = [
+        ('Total Scenarios', len(df)),
+        ('High Business Value', int((df['Business Value'] == 'High').sum())),
+        ('High Feasibility', int((df['Feasibility'] == 'High').sum())),
+        ('Quick Wins', len(data['quadrant_index']['High-High'])),
+    ]
+    return '<h3>📈 Summary Statistics</h3><div class="metrics">' + ''.join(
+        f'<div><div>{label}</div><div class="metric-big">{value}</div></div>' for label, value in metrics
+    ) + '</div>'
+
+
+def render_overview(data, built):
+    fig, _ = dashboard_views.create_category_heatmap(data['df'], data['category_counts'])
+    heatmap = fig.to_html(full_html=False, include_plotlyjs=False)
+    body = ''.join([
+        '<h1 class="main-header">Fraud Framework Priority Matrix</h1>',
+        "<h3 style='text-align: center;'>Priority Matrix - Click on any quadrant to explore scenarios in detail</h3>",
+        render_matrix(data),
+        '<hr><h2>📊 Category Analysis</h2>',
+        heatmap,
+        '<hr>',
+        render_summary(data),
+    ])
+    return render_page(
+        'Fraud Framework Matrix', body, data['version'], built,
+        head='<script src="plotly.min.js"></script>'
+    )
+
+
+def render_quadrant_pages(data, key, built):
+    """Yield (file name, HTML) for every page of one quadrant's scenario cards"""
+    rows = data['quadrant_index'][key]
+    info = dashboard_views.get_quadrant_info(*key.split('-'))
+    page_count = max(1, math.ceil(len(rows) / CARDS_PER_PAGE))
+    df = data['df']
+
+    for page in range(1, page_count + 1):
+        start = (page - 1) * CARDS_PER_PAGE
+        stop = min(start + CARDS_PER_PAGE, len(rows))
+        pager = '<div class="pager">'
+        pager += f'<a href="{quadrant_page_name(key, page - 1)}">&larr; Previous</a>' if page > 1 else '<span></span>'
+        pager += f'<span>Scenarios {start + 1}-{stop} of {len(rows)} (page {page} of {page_count})</span>' if rows.size else '<span></span>'
+        pager += f'<a href="{quadrant_page_name(key, page + 1)}">Next &rarr;</a>' if page < page_count else '<span></span>'
+        pager += '</div>'
+
+        parts = [
+            '<p><a href="index.html">🔙 Back to Matrix Overview</a></p>',
+            f'<h2>{info["icon"]} {html.escape(info["title"])} - {len(rows)} Scenarios</h2>',
+            f'<p><em>{html.escape(info["description"])}</em></p>',
+            pager,
+        ]
+        if not rows.size:
+            parts.append(f'<p>No scenarios currently exist in the {html.escape(info["title"])} quadrant.</p>')
+        for idx, position in enumerate(rows[start:stop], start=start):
+            card = dashboard_views.render_scenario_card(df.iloc[int(position)])
+            parts.append(f'<h3>Scenario {idx + 1}</h3>{card}<hr>')
+        parts.append(pager)
+
+        yield quadrant_page_name(key, page), render_page(
+            f"{info['title']} - Fraud Framework Matrix", ''.join(parts), data['version'], built
+        )
+
+
+def built_version(output):
+    """Catalog version of the snapshot currently in `output`, if any"""
+    try:
+        with open(os.path.join(output, MANIFEST)) as handle:
+            return json.load(handle).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def _builds_dir(output):
+    return f"{output}.builds"
+
+
+def _pid_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _adopt_existing(output):
+    """Move a snapshot published as a plain directory into the builds directory.
+
+    Covers snapshots written before builds were published through a link, and
+    a crash of that older scheme between moving the live directory aside and
+    moving the new one in, which left only `<output>.retired-<pid>` behind.
+    """
+    builds = _builds_dir(output)
+    if os.path.islink(output):
+        return
+    if os.path.isdir(output):
+        previous = output
+    else:
+        retired = sorted(glob.glob(f"{glob.escape(output)}.retired-*"), key=os.path.getmtime)
+        if not retired:
+            return
+        previous = retired[-1]
+        logger.warning("Recovering the snapshot left in %s", previous)
+    adopted = os.path.join(builds, f"build-{time.time_ns()}-adopted")
+    os.makedirs(builds, exist_ok=True)
+    # The one moment without a published snapshot, once, when the layout is converted
+    os.replace(previous, adopted)
+    _publish(output, adopted)
+
+
+def _publish(output, build):
+    """Point the `output` link at `build`, replacing the old link in a single rename"""
+    link = f"{output}.link-{os.getpid()}"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.relpath(build, os.path.dirname(output)), link)
+    os.replace(link, output)
+
+
+def _prune_builds(output, keep):
+    """Remove superseded builds and the leftovers of builds whose process died"""
+    for path in glob.glob(f"{glob.escape(output)}.retired-*"):
+        shutil.rmtree(path, ignore_errors=True)
+    builds = _builds_dir(output)
+    kept_at = int(os.path.basename(keep).split('-')[1])
+    for name in os.listdir(builds):
+        path = os.path.join(builds, name)
+        if path == keep:
+            continue
+        _, started, pid = name.split('-', 2)
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            # A newer build finished by another process is about to be published
+            superseded = int(started) < kept_at
+        else:
+            superseded = not pid.isdigit() or not _pid_running(int(pid))
+        if superseded:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def build_snapshot(csv_path, output, force=False):
+    """Render the snapshot of the current catalog version; return True if it was (re)built"""
+    version = scenario_store.ensure_store(csv_path)
+    if not force and built_version(output) == version:
+        return False
+
+    start = time.perf_counter()
+    data = scenario_data.build_dataset(scenario_store.open_store(csv_path), version)
+    built = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    output = os.path.abspath(output)
+    _adopt_existing(output)
+    staging = os.path.join(_builds_dir(output), f"build-{time.time_ns()}-{os.getpid()}")
+    os.makedirs(staging)
+    try:
+        pages = [('index.html', render_overview(data, built))]
+        for key in scenario_data.QUADRANT_NAMES:
+            pages.extend(render_quadrant_pages(data, key, built))
+        for name, content in pages:
+            with open(os.path.join(staging, name), 'w', encoding='utf-8') as handle:
+                handle.write(content)
+        with open(os.path.join(staging, 'plotly.min.js'), 'w', encoding='utf-8') as handle:
+            handle.write(plotly.offline.get_plotlyjs())
+        with open(os.path.join(staging, MANIFEST), 'w') as handle:
+            json.dump({
+                'version': version,
+                'source': os.path.abspath(csv_path),
+                'built': built,
+                'pages': [name for name, _ in pages],
+            }, handle, indent=2)
+
+        _publish(output, staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    # Readers that resolved the old link mid-request lose at most that request
+    _prune_builds(output, staging)
+
+    logger.info("Built snapshot of %s (%s) in %.2fs: %d pages",
+                csv_path, version[:12], time.perf_counter() - start, len(pages))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=scenario_store.DEFAULT_CSV, help='catalog CSV to render')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='snapshot directory')
+    parser.add_argument('--force', action='store_true', help='rebuild even if the catalog is unchanged')
+    parser.add_argument('--watch', action='store_true', help='keep running and rebuild when the CSV changes')
+    parser.add_argument('--interval', type=float, default=5.0, help='seconds between checks with --watch')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+
+    try:
+        if not build_snapshot(args.csv, args.output, force=args.force):
+            logger.info("Snapshot in %s is already up to date", args.output)
+    except (OSError, ValueError) as e:
+        logger.error("Could not build snapshot: %s", e)
+        if not args.watch:
+            sys.exit(1)
+
+    while args.watch:
+        time.sleep(args.interval)
+        try:
+            build_snapshot(args.csv, args.output)
+        except (OSError, ValueError) as e:
+            # Keep serving the previous snapshot until the CSV is fixed
+            logger.warning("Could not rebuild snapshot: %s", e)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import dashboard_auth  # noqa: E402
+
+PASSWORD = 'correct horse battery staple'
+
+
+@pytest.fixture
+def user_store(tmp_path, monkeypatch):
+    """A user store holding only `analyst`, signed with a throwaway secret"""
+    monkeypatch.setenv('FRAUD_DASHBOARD_AUTH_SECRET', 'test-secret')
+    monkeypatch.setattr(dashboard_auth, '_secret', None)
+    store = dashboard_auth.UserStore(str(tmp_path / 'users.json'))
+    with store.editing() as users:
+        users['analyst'] = {'hash': dashboard_auth.hash_password(PASSWORD, iterations=1000), 'generation': 0}
+    monkeypatch.setattr(dashboard_auth, '_store', store)
+    return store
+
+
+@pytest.fixture
+def dashboard(user_store, monkeypatch):
+    """The dashboard in Streamlit's AppTest, signed in through its login form"""
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, 'fraud_dashboard.py'), default_timeout=60)
+    at.run()
+    at.text_input(key='username').input('analyst')
+    at.text_input(key='password').input(PASSWORD).run()
+    assert not at.exception
+    return at
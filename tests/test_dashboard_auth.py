@@ -0,0 +1,78 @@
+import json
+import os
+
+import pytest
+
+import dashboard_auth
+from conftest import PASSWORD
+
+
+def test_password_hash_round_trip():
+    stored = dashboard_auth.hash_password('s3cret', iterations=1000)
+    assert stored.startswith('pbkdf2_sha256$1000$')
+    assert dashboard_auth.check_hash('s3cret', stored)
+    assert not dashboard_auth.check_hash('S3cret', stored)
+    assert not dashboard_auth.check_hash('s3cret', 'not-a-hash')
+
+
+def test_store_verifies_passwords(user_store):
+    assert user_store.verify('analyst', PASSWORD)
+    assert not user_store.verify('analyst', 'wrong')
+    assert not user_store.verify('nobody', PASSWORD)
+
+
+def test_token_round_trip(user_store):
+    token = dashboard_auth.issue_token('analyst')
+    assert dashboard_auth.verify_token(token) == 'analyst'
+
+
+def test_tampered_token_is_rejected(user_store):
+    payload, signature = dashboard_auth.issue_token('analyst').split('.')
+    forged = dashboard_auth._b64encode(json.dumps(['analyst', 2**40, 0]).encode())
+    assert dashboard_auth.verify_token(f"{forged}.{signature}") is None
+    assert dashboard_auth.verify_token(f"{payload}.{signature[:-2]}") is None
+    assert dashboard_auth.verify_token('') is None
+    assert dashboard_auth.verify_token(None) is None
+
+
+def test_expired_token_is_rejected(user_store):
+    assert dashboard_auth.verify_token(dashboard_auth.issue_token('analyst', hours=-1)) is None
+
+
+def test_revocation_ends_earlier_sessions_only(user_store):
+    old = dashboard_auth.issue_token('analyst')
+    dashboard_auth.revoke_sessions('analyst')
+    assert user_store.generation('analyst') == 1
+    assert dashboard_auth.verify_token(old) is None
+
+    new = dashboard_auth.issue_token('analyst')
+    assert dashboard_auth.verify_token(new) == 'analyst'
+
+
+def test_removed_user_loses_sessions(user_store):
+    token = dashboard_auth.issue_token('analyst')
+    with user_store.editing() as users:
+        del users['analyst']
+    assert dashboard_auth.verify_token(token) is None
+
+
+def test_corrupt_store_fails_closed(user_store):
+    token = dashboard_auth.issue_token('analyst')
+    with open(user_store.path, 'w') as handle:
+        handle.write('{"analyst": {"hash": ')  # half-written
+
+    store = dashboard_auth.get_user_store()
+    assert store.users == {}
+    assert not store.verify('analyst', PASSWORD)
+    assert dashboard_auth.verify_token(token) is None
+
+
+def test_corrupt_store_is_never_saved_over(user_store):
+    with open(user_store.path, 'w') as handle:
+        handle.write('[]')
+    with pytest.raises(ValueError):
+        with user_store.editing() as users:
+            users.clear()
+    with open(user_store.path) as handle:
+        assert handle.read() == '[]'
+    assert not [name for name in os.listdir(os.path.dirname(user_store.path)) if name.endswith('.tmp')]
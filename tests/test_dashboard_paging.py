@@ -0,0 +1,29 @@
+BACK = "🔙 Back to Matrix Overview"
+
+
+def _back(at):
+    next(button for button in at.button if button.label == BACK).click().run()
+
+
+def test_reopening_a_quadrant_after_going_back(dashboard):
+    at = dashboard
+    at.button(key='high-high').click().run()
+    assert not at.exception
+    assert at.number_input(key='page-quadrant').value == 1
+
+    _back(at)
+    assert not at.exception
+
+    at.button(key='high-high').click().run()
+    assert not at.exception
+    assert at.number_input(key='page-quadrant').value == 1
+
+
+def test_search_page_survives_clearing_and_retyping(dashboard):
+    at = dashboard
+    at.text_input(key='search_query').input('card').run()
+    assert not at.exception
+    at.text_input(key='search_query').input('').run()
+    at.text_input(key='search_query').input('card').run()
+    assert not at.exception
+    assert at.number_input(key='page-search').value == 1
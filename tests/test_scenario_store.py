@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scenario_data
+import scenario_store
+
+
+def _catalog(categories):
+    return pd.DataFrame({
+        'Category': categories,
+        'Scenario': [f"Scenario {i}" for i in range(len(categories))],
+        'Effort': 'Low',
+        'Complexity': 'Low',
+        'Feasibility': ['High', 'Low', 'High'][:len(categories)],
+        'Business Value': 'High',
+    })
+
+
+def test_missing_categories_are_uncategorized():
+    df = scenario_store.apply_schema(_catalog([np.nan, '  ', ' Refunds ']))
+    assert df['Category'].tolist() == ['Uncategorized', 'Uncategorized', 'Refunds']
+
+    counts = scenario_data.category_counts(df)
+    assert sorted(counts.index) == ['Refunds', 'Uncategorized']
+    assert counts.loc['Uncategorized'].sum() == 2
+
+
+def test_missing_columns_are_named():
+    with pytest.raises(ValueError, match='Feasibility'):
+        scenario_store.apply_schema(_catalog(['Refunds']).drop(columns='Feasibility'))